@@ -0,0 +1,122 @@
+import logging
+import statistics
+import threading
+from collections import deque
+from typing import Any, Dict, List
+from langchain_core.callbacks import BaseCallbackHandler
+from backend.services.metrics import agent_tool_calls, llm_calls, llm_tokens
+
+logger = logging.getLogger(__name__)
+
+BOOKING_TOOLS = {"book_if_free", "find_and_book", "create_calendar_events_bulk"}
+# AgentExecutor's canned answer when it runs out of iterations or time
+_STOPPED_PREFIX = "Agent stopped due to"
+
+
+def reports_error(output: str) -> bool:
+    """True for a tool answer that reports a failure: "❌ ..." text or a JSON error status."""
+    return output.startswith("❌") or output.startswith('{"status":"error"')
+
+
+class CallAccountingHandler(BaseCallbackHandler):
+    """Counts LLM calls, tool calls and tokens for a single agent run."""
+
+    # Plain counters; no need to hop to a thread for them on the async path
+    run_inline = True
+
+    def __init__(self):
+        self.llm_calls = 0
+        self.tool_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.tools: List[str] = []
+        self.tool_errors = 0
+        self.booked = False
+        self.stopped = False
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, **kwargs):
+        self.llm_calls += 1
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts, **kwargs):
+        self.llm_calls += 1
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.input_tokens += usage.get("input_tokens", 0)
+                    self.output_tokens += usage.get("output_tokens", 0)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs):
+        self.tool_calls += 1
+        self.tools.append((serialized or {}).get("name") or kwargs.get("name", "unknown"))
+
+    def on_tool_end(self, output: Any, **kwargs):
+        output = str(getattr(output, "content", output))
+        if reports_error(output):
+            self.tool_errors += 1
+        if self.tools and self.tools[-1] in BOOKING_TOOLS and "🎉 SUCCESS!" in output:
+            self.booked = True
+
+    def on_tool_error(self, error: BaseException, **kwargs):
+        self.tool_errors += 1
+
+    def on_agent_finish(self, finish, **kwargs):
+        if str(finish.return_values.get("output", "")).startswith(_STOPPED_PREFIX):
+            self.stopped = True
+
+    @property
+    def clean(self) -> bool:
+        """No tool reported an error and the agent finished on its own."""
+        return not self.tool_errors and not self.stopped
+
+    def summary(self) -> Dict:
+        return {
+            "llm_calls": self.llm_calls,
+            "tool_calls": self.tool_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "tools": self.tools,
+            "tool_errors": self.tool_errors,
+            "booked": self.booked,
+            "stopped": self.stopped,
+        }
+
+
+class AgentCallStats:
+    """Per-request call counts over a window of recent agent runs."""
+
+    def __init__(self, window: int = 1000):
+        self._runs: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.runs = 0
+
+    def record(self, handler: CallAccountingHandler):
+        summary = handler.summary()
+        logger.info(
+            f"Agent run: {summary['llm_calls']} LLM calls, {summary['tool_calls']} tool calls "
+            f"({', '.join(summary['tools']) or 'none'}), {summary['input_tokens']}+{summary['output_tokens']} tokens"
+        )
+        llm_calls.inc(summary["llm_calls"])
+        agent_tool_calls.inc(summary["tool_calls"])
+        llm_tokens.labels(direction="input").inc(summary["input_tokens"])
+        llm_tokens.labels(direction="output").inc(summary["output_tokens"])
+        with self._lock:
+            self._runs.append(summary)
+            self.runs += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            runs = list(self._runs)
+        bookings = [run for run in runs if run["booked"]]
+        return {
+            "runs": self.runs,
+            "median_llm_calls": statistics.median(run["llm_calls"] for run in runs) if runs else None,
+            "median_llm_calls_per_booking": statistics.median(run["llm_calls"] for run in bookings) if bookings else None,
+            "median_tool_calls": statistics.median(run["tool_calls"] for run in runs) if runs else None,
+            "avg_tokens": round(sum(run["input_tokens"] + run["output_tokens"] for run in runs) / len(runs), 1) if runs else None,
+        }
+
+
+agent_call_stats = AgentCallStats()
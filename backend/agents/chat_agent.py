@@ -1,24 +1,28 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents import create_tool_calling_agent, AgentExecutor
 from langchain.prompts import ChatPromptTemplate
-from backend.tools.calendar_tools import get_calendar_availability, create_calendar_event, suggest_time_slots
+from typing import AsyncIterator, Dict, List, Optional
+from backend.agents.call_accounting import CallAccountingHandler, agent_call_stats
+from backend.agents.trace_handler import agent_trace_handler
+from backend.tools.calendar_tools import create_calendar_events_bulk, suggest_time_slots, find_group_slots
+from backend.tools.composite_tools import resolve_and_check, find_and_book, week_summary
 from backend.config import settings
 
 class ChatAgent:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+    def __init__(self, llm=None):
+        self.llm = llm or ChatGoogleGenerativeAI(
             model="gemini-2.0-flash",
             google_api_key=settings.GOOGLE_API_KEY,
             temperature=0.1
         )
         
-        self.tools = [get_calendar_availability, create_calendar_event, suggest_time_slots]
+        self.tools = [resolve_and_check, find_and_book, week_summary, create_calendar_events_bulk, suggest_time_slots, find_group_slots]
         self.prompt = self._create_prompt()
         self.agent = create_tool_calling_agent(self.llm, self.tools, self.prompt)
         self.agent_executor = AgentExecutor(
             agent=self.agent,
             tools=self.tools,
-            verbose=True,
+            verbose=settings.AGENT_VERBOSE,
             max_iterations=4
         )
     
@@ -29,22 +33,25 @@ class ChatAgent:
 PERSONALITY: Helpful, proactive, and smart about understanding user requests.
 
 CORE ABILITIES:
-1. Check calendar availability for any date
+1. Check calendar availability for any date or date range
 2. Book appointments with complete details
 3. Suggest optimal time slots when asked
 4. Handle natural language date/time requests
 
 SMART BEHAVIOR:
-- When user asks "what are free slots" or "suggest times", use suggest_time_slots tool
-- When user says "tomorrow", convert to actual date (current_date + 1 day)
-- When user asks about "this week" or "Friday", be smart about dates
+- Pass date phrases like "tomorrow" or "next friday" straight to the tools' `when` argument; they resolve dates themselves
+- For "am I free" or "what's on" questions about a day or range, call resolve_and_check once
+- For "how does my week look", call week_summary once
+- When user asks "what are free slots" or "suggest times", use suggest_time_slots (with end_date for ranges)
+- For the same event on several dates (e.g. "standups every weekday next week"), call create_calendar_events_bulk once with all the dates
+- When a time must work for other people, call find_group_slots once with all their calendar emails
+- resolve_and_check, find_and_book and week_summary answer in JSON; read the fields, don't call another tool to double-check
 - Always provide specific, actionable suggestions
 
 BOOKING WORKFLOW:
-1. Extract: title, date, start_time, end_time from user request
-2. Check availability first
-3. If available, book immediately
-4. Confirm with success message
+1. Call find_and_book ONCE: it resolves the date, checks for conflicts and books atomically. Never check availability first
+2. Pass start_time for an exact time; leave it out (optionally with earliest/latest) to take the first free slot
+3. On "conflict", offer the alternatives it returns; on "booked", reply with its "message" field
 
 CONVERSATION CONTEXT:
 {conversation_context}
@@ -57,9 +64,58 @@ IMPORTANT: Be proactive and helpful. If user asks for suggestions, actually sugg
         ])
     
     def process_message(self, message: str, current_date: str, conversation_context: str) -> str:
+        accounting = CallAccountingHandler()
         response = self.agent_executor.invoke({
             "input": message,
             "current_date": current_date,
             "conversation_context": conversation_context
-        })
+        }, config={"callbacks": _callbacks(accounting)})
+        agent_call_stats.record(accounting)
         return response["output"]
+
+    async def aprocess_message(self, message: str, current_date: str, conversation_context: str,
+                               accounting: Optional[CallAccountingHandler] = None) -> str:
+        """Pass `accounting` to inspect the run afterwards, e.g. whether any tool failed."""
+        accounting = accounting or CallAccountingHandler()
+        response = await self.agent_executor.ainvoke({
+            "input": message,
+            "current_date": current_date,
+            "conversation_context": conversation_context
+        }, config={"callbacks": _callbacks(accounting)})
+        agent_call_stats.record(accounting)
+        return response["output"]
+
+    async def astream_message(self, message: str, current_date: str, conversation_context: str,
+                              accounting: Optional[CallAccountingHandler] = None) -> AsyncIterator[Dict]:
+        """Agent progress as it happens: tool_start/tool_end, LLM tokens, then the final answer."""
+        inputs = {
+            "input": message,
+            "current_date": current_date,
+            "conversation_context": conversation_context
+        }
+        accounting = accounting or CallAccountingHandler()
+        async for event in self.agent_executor.astream_events(inputs, config={"callbacks": _callbacks(accounting)}, version="v2"):
+            kind = event["event"]
+            if kind == "on_tool_start":
+                yield {"type": "tool_start", "tool": event["name"], "input": event["data"].get("input")}
+            elif kind == "on_tool_end":
+                yield {"type": "tool_end", "tool": event["name"]}
+            elif kind == "on_chat_model_stream":
+                text = _chunk_text(event["data"]["chunk"])
+                if text:
+                    yield {"type": "token", "text": text}
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                agent_call_stats.record(accounting)
+                yield {"type": "final", "text": event["data"]["output"]["output"]}
+
+
+def _callbacks(accounting: CallAccountingHandler) -> List:
+    tracer = agent_trace_handler()
+    return [accounting, tracer] if tracer else [accounting]
+
+
+def _chunk_text(chunk) -> str:
+    # Gemini may return content as a list of parts instead of a plain string
+    if isinstance(chunk.content, str):
+        return chunk.content
+    return "".join(part.get("text", "") for part in chunk.content if isinstance(part, dict))
@@ -0,0 +1,44 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from backend.services.tracing import Span, current_span
+
+
+class AgentTraceHandler(BaseCallbackHandler):
+    """Adds one span per agent iteration (LLM call) under the span that started the run.
+
+    Tool calls trace themselves through the tool wrappers, so the tree shows
+    each model round trip next to the tools and Google calls it led to.
+    """
+
+    run_inline = True
+
+    def __init__(self, parent: Span):
+        self.parent = parent
+        self.iterations = 0
+        self._spans: Dict[UUID, Span] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, *, run_id: UUID, **kwargs):
+        self.iterations += 1
+        self._spans[run_id] = self.parent.child("llm", iteration=self.iterations)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        usage = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or usage
+        span.finish(tokens_in=usage.get("input_tokens"), tokens_out=usage.get("output_tokens"))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            span.finish(error=type(error).__name__)
+
+
+def agent_trace_handler() -> Optional[AgentTraceHandler]:
+    """A handler for the current traced request, or None when tracing is off."""
+    parent = current_span()
+    return AgentTraceHandler(parent) if parent is not None else None
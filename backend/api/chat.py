@@ -1,45 +1,247 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+import json
+import logging
+import time
+from backend.agents.call_accounting import CallAccountingHandler, agent_call_stats
 from backend.models.chat import ChatMessage, ChatResponse
+from backend.services.calendar_service import calendar_service_stats, calendar_version, get_calendar_service
 from backend.services.conversation_service import ConversationService
 from backend.services.date_parser import DateParser
-from backend.agents.chat_agent import ChatAgent
+from backend.services.concurrency import chat_limiter, run_blocking, run_storage, ServerBusyError
+from backend.services.intent_router import IntentRouter
+from backend.services.prefetcher import prefetcher
+from backend.services.metrics import chat_in_flight, chat_requests, chat_stage_seconds
+from backend.services.response_cache import CacheKey, ResponseCache, is_cacheable
+from backend.services.startup import Lazy, startup_report
+from backend.services.tracing import trace_request, trace_span
+from backend.tools.calendar_tools import read_tool_stats
 from backend.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 conversation_service = ConversationService()
 date_parser = DateParser()
-chat_agent = ChatAgent()
+intent_router = IntentRouter()
+response_cache = ResponseCache()
+_stages = {
+    stage: chat_stage_seconds.labels(stage=stage)
+    for stage in ("context", "route", "date_parse", "cache", "agent", "total")
+}
+
+
+@contextmanager
+def _stage(name: str):
+    with trace_span(name), _stages[name].time():
+        yield
+
+
+def _create_chat_agent():
+    # Deferred import: the agent pulls in LangChain and the Gemini client
+    from backend.agents.chat_agent import ChatAgent
+    return ChatAgent()
+
+
+chat_agent = Lazy(_create_chat_agent, "chat_agent")
+
+
+async def get_chat_agent():
+    if chat_agent.initialized:
+        return chat_agent.get()
+    # First use builds the executor; keep that off the event loop
+    return await run_blocking(chat_agent.get)
+
+
+def _begin_turn(message: ChatMessage) -> Tuple[str, str]:
+    """Blocking: current date and prompt context for this turn; records the user's message."""
+    current_date = datetime.now(settings.IST).strftime("%Y-%m-%d")
+    context, context_tokens = conversation_service.get_context_with_tokens(message.user_id)
+    logger.info(f"Prompt context for {message.user_id}: ~{context_tokens} tokens")
+    conversation_service.update_history(message.user_id, "user", message.message)
+    return current_date, context
+
+
+def _agent_input(text: str, current_date: str) -> Tuple[str, Optional[Tuple[str, str]]]:
+    """The message with its resolved date context appended, and that date range."""
+    date_range = date_parser.parse_date_range(text, current_date)
+    if not date_range:
+        return text, None
+    start_date, end_date = date_range
+    suggested_date = start_date if start_date == end_date else f"{start_date} to {end_date}"
+    return f"{text} (Date context: {suggested_date})", date_range
+
+
+def _cache_key(text: str, date_range: Optional[Tuple[str, str]], current_date: str) -> Optional[CacheKey]:
+    """Blocking: brings the event store up to date so outside calendar edits change the version too."""
+    # Only self-contained questions about concrete dates are worth sharing across users
+    if not settings.RESPONSE_CACHE_ENABLED or not date_range or not is_cacheable(text):
+        return None
+    calendar_service = get_calendar_service()
+    if calendar_service.available and settings.EVENT_CACHE_ENABLED:
+        try:
+            # Much tighter than the store's own bound: a stale version here serves old answers for the whole TTL
+            calendar_service.event_store().ensure_fresh(settings.RESPONSE_CACHE_MAX_STALENESS)
+        except Exception as e:
+            logger.warning(f"Skipping response cache, calendar sync failed: {e}")
+            return None
+    return response_cache.key(text, date_range, current_date, calendar_version())
+
+
+def _remember(key: Optional[CacheKey], response: str, accounting: CallAccountingHandler):
+    # A run that booked or saw the calendar change produced an answer for a calendar that no longer exists
+    if not key or "🎉 SUCCESS!" in response or key.calendar_version != calendar_version():
+        return
+    # Tool failures and "Agent stopped due to max iterations" would be served to everyone for the TTL
+    if not accounting.clean:
+        logger.info(f"Not caching an agent answer with {accounting.tool_errors} tool errors (stopped={accounting.stopped})")
+        return
+    response_cache.put(key, response)
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(message: ChatMessage):
-    try:
-        current_date = datetime.now(settings.IST).strftime("%Y-%m-%d")
-        user_id = message.user_id
 
-        context = conversation_service.get_context(user_id)
-        conversation_service.update_history(user_id, "user", message.message)
+def _error_response(error: Exception) -> str:
+    return f"❌ I encountered an error: {str(error)}. Please try again."
 
-        processed_message = message.message
-        if any(word in message.message.lower() for word in ["tomorrow", "friday", "this week", "next week"]):
-            suggested_date = date_parser.parse_natural_date(message.message, current_date)
-            processed_message = f"{message.message} (Date context: {suggested_date})"
 
-        bot_response = chat_agent.process_message(processed_message, current_date, context)
-        conversation_service.update_history(user_id, "assistant", bot_response)
+# Runs the agent for one turn: yields progress events, then {"type": "final", "text": ...}
+AgentStep = Callable[[Any, str, str, str, CallAccountingHandler], AsyncIterator[Dict]]
 
-        booking_success = "🎉 SUCCESS!" in bot_response
 
-        return ChatResponse(
-            response=bot_response,
-            booking_success=booking_success
+async def _answer(agent, agent_input: str, current_date: str, context: str,
+                  accounting: CallAccountingHandler) -> AsyncIterator[Dict]:
+    yield {"type": "final", "text": await agent.aprocess_message(agent_input, current_date, context, accounting)}
+
+
+async def _stream_answer(agent, agent_input: str, current_date: str, context: str,
+                         accounting: CallAccountingHandler) -> AsyncIterator[Dict]:
+    async for event in agent.astream_message(agent_input, current_date, context, accounting):
+        yield event
+
+
+async def _turn(message: ChatMessage, endpoint: str, agent_step: AgentStep) -> AsyncIterator[Dict]:
+    """One chat turn: the intent router, then the response cache, then the agent through agent_step.
+
+    Yields the agent's progress events and finally {"type": "done", ...}.
+    Failures are recorded here and re-raised for the endpoint to report.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    chat_in_flight.inc()
+    with trace_request(endpoint, user_id=message.user_id, message=message.message[:200]) as trace:
+        try:
+            async with chat_limiter.slot():
+                user_id = message.user_id
+                with _stage("context"):
+                    # The SQLite store can wait on its lock or on other writers; keep that off the loop
+                    current_date, context = await run_storage(_begin_turn, message)
+
+                outcome = "router"
+                with _stage("route"):
+                    bot_response = await run_blocking(intent_router.route, message.message, current_date)
+                if bot_response is None:
+                    outcome = "cache"
+                    with _stage("date_parse"):
+                        agent_input, date_range = _agent_input(message.message, current_date)
+                    with _stage("cache"):
+                        cache_key = await run_blocking(_cache_key, message.message, date_range, current_date)
+                        bot_response = response_cache.get(cache_key) if cache_key else None
+                    if bot_response is None:
+                        outcome = "agent"
+                        accounting = CallAccountingHandler()
+                        with _stage("agent"):
+                            agent = await get_chat_agent()
+                            bot_response = ""
+                            async for event in agent_step(agent, agent_input, current_date, context, accounting):
+                                if event["type"] == "final":
+                                    bot_response = event["text"]
+                                else:
+                                    yield event
+                        _remember(cache_key, bot_response, accounting)
+                await run_storage(conversation_service.update_history, user_id, "assistant", bot_response)
+                startup_report.record_request(time.perf_counter() - started)
+
+                yield {"type": "done", "response": bot_response, "booking_success": "🎉 SUCCESS!" in bot_response}
+
+        except ServerBusyError:
+            outcome = "busy"
+            raise
+        except Exception as e:
+            outcome = "error"
+            await run_storage(conversation_service.update_history, message.user_id, "assistant", _error_response(e))
+            raise
+        finally:
+            chat_in_flight.dec()
+            _stages["total"].observe(time.perf_counter() - started)
+            chat_requests.labels(endpoint=endpoint, outcome=outcome).inc()
+            if trace:
+                trace.attrs["outcome"] = outcome
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(message: ChatMessage):
+    done = None
+    try:
+        async for event in _turn(message, "chat", _answer):
+            done = event
+    except ServerBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"⏳ The assistant is busy right now ({e}). Please try again in a moment.",
+            headers={"Retry-After": "2"},
         )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=_error_response(e))
+    return ChatResponse(
+        response=done["response"],
+        booking_success=done["booking_success"]
+    )
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
+
+async def _chat_events(message: ChatMessage):
+    # First byte goes out before any queueing, context building or LLM work
+    yield _sse("status", {"stage": "received"})
+    try:
+        async for event in _turn(message, "chat_stream", _stream_answer):
+            if event["type"] == "done":
+                yield _sse("done", {"response": event["response"], "booking_success": event["booking_success"]})
+            else:
+                yield _sse(event["type"], event)
+    except ServerBusyError as e:
+        yield _sse("error", {"detail": f"⏳ The assistant is busy right now ({e}). Please try again in a moment."})
     except Exception as e:
-        error_response = f"❌ I encountered an error: {str(e)}. Please try again."
-        conversation_service.update_history(message.user_id, "assistant", error_response)
-        raise HTTPException(status_code=500, detail=error_response)
+        yield _sse("error", {"detail": _error_response(e)})
+
+
+@router.post("/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """Server-sent events: status, tool_start/tool_end, token, then done (or error)."""
+    return StreamingResponse(
+        _chat_events(message),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now(settings.IST).isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now(settings.IST).isoformat(),
+        "chat": chat_limiter.stats(),
+        "intent_router": intent_router.stats(),
+        "conversations": await run_storage(conversation_service.stats),
+        "calendar": calendar_service_stats(),
+        "read_tools": read_tool_stats(),
+        "response_cache": response_cache.stats(),
+        "agent_calls": agent_call_stats.stats(),
+        "prefetch": prefetcher.stats(),
+    }
+
+@router.get("/startup")
+async def startup_timings():
+    return startup_report.report()
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException
+from backend.models.booking import BulkBookingRequest, BulkBookingResponse, BookingResult
+from backend.services.calendar_service import event_body, get_calendar_service
+from backend.services.concurrency import run_blocking
+from backend.config import settings
+
+router = APIRouter()
+
+
+@router.post("/events/bulk", response_model=BulkBookingResponse)
+async def create_events_bulk(request: BulkBookingRequest):
+    if len(request.events) > settings.BULK_MAX_EVENTS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_MAX_EVENTS} events per request")
+
+    bodies = []
+    invalid = {}
+    for index, event in enumerate(request.events):
+        try:
+            bodies.append(event_body(event.title, event.date, event.start_time, event.end_time, event.description or ""))
+        except ValueError as e:
+            # Keep positions aligned; the service reports it as invalid
+            bodies.append({"summary": event.title, "start": {}, "end": {}})
+            invalid[index] = str(e)
+
+    calendar_service = await run_blocking(get_calendar_service)
+    if not calendar_service.available:
+        raise HTTPException(status_code=503, detail="Calendar service not available")
+
+    try:
+        results = await run_blocking(calendar_service.create_events_bulk, bodies)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"❌ Bulk booking failed: {str(e)}")
+
+    response = []
+    for result in results:
+        event = result.get("event") or {}
+        response.append(BookingResult(
+            index=result["index"],
+            status=result["status"],
+            event_id=event.get("id"),
+            error=invalid.get(result["index"], result.get("error")),
+            conflicts=result.get("conflicts", []),
+        ))
+    return BulkBookingResponse(booked=sum(result.status == "booked" for result in response), results=response)
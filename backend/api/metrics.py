@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from backend.services.api_scheduler import calendar_scheduler
+from backend.services.concurrency import chat_limiter
+from backend.services.metrics import Gauge, registry
+
+router = APIRouter()
+
+# Existing counters read at scrape time rather than mirrored on every update
+registry.register(Gauge(
+    "calendent_chat_waiting", "Chat requests queued for a concurrency slot"
+)).set_function(lambda: chat_limiter.waiting)
+registry.register(Gauge(
+    "calendent_google_api_queue_depth", "Google Calendar calls waiting for quota"
+)).set_function(lambda: calendar_scheduler.queue_depth)
+registry.register(Gauge(
+    "calendent_google_api_rate", "Current Google Calendar call rate limit per second"
+)).set_function(lambda: calendar_scheduler.rate)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -14,6 +14,87 @@ class Settings:
     PORT = 8001
     MAX_CONVERSATION_HISTORY = 20
     RECENT_MESSAGES_LIMIT = 6
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "400"))
+    CONTEXT_MAX_REPLY_CHARS = 200
+    MAX_CONVERSATION_USERS = int(os.getenv("MAX_CONVERSATION_USERS", "10000"))
+    MAX_CONVERSATION_BYTES = int(os.getenv("MAX_CONVERSATION_BYTES", str(64 * 1024 * 1024)))
+    CONVERSATION_IDLE_TTL = float(os.getenv("CONVERSATION_IDLE_TTL", str(6 * 60 * 60)))
+
+    # "memory" keeps conversations per process; "sqlite" shares them across workers
+    CONVERSATION_BACKEND = os.getenv("CONVERSATION_BACKEND", "memory")
+    CONVERSATION_DB_PATH = os.getenv("CONVERSATION_DB_PATH", "conversations.db")
+    CONVERSATION_BATCH_SIZE = 32
+    CONVERSATION_FLUSH_INTERVAL = 0.25
+    # How long a flush waits for another worker's write lock before trying again later
+    CONVERSATION_BUSY_TIMEOUT = float(os.getenv("CONVERSATION_BUSY_TIMEOUT", "5"))
+
+    # Concurrency limits for the chat pipeline
+    CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "32"))
+    CHAT_MAX_QUEUED = int(os.getenv("CHAT_MAX_QUEUED", "64"))
+    CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "10"))
+    CALENDAR_WORKER_THREADS = int(os.getenv("CALENDAR_WORKER_THREADS", "16"))
+    CALENDAR_POOL_SIZE = int(os.getenv("CALENDAR_POOL_SIZE", str(CALENDAR_WORKER_THREADS)))
+    STORAGE_WORKER_THREADS = int(os.getenv("STORAGE_WORKER_THREADS", "4"))
+    CALENDAR_HTTP_TIMEOUT = 30
+    CALENDAR_POOL_ACQUIRE_TIMEOUT = 30
+
+    # Google Calendar quota: sustained calls per second, burst size and retry backoff
+    CALENDAR_QPS = float(os.getenv("CALENDAR_QPS", "10"))
+    CALENDAR_BURST = int(os.getenv("CALENDAR_BURST", "20"))
+    CALENDAR_MAX_RETRIES = 5
+    CALENDAR_BACKOFF_BASE = 0.5
+    CALENDAR_BACKOFF_MAX = 16
+
+    # Print every agent step to stdout; /metrics and the logs cover normal operation
+    AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "false").lower() == "true"
+
+    # Build the agent and calendar client in the background right after startup
+    STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+
+    EVENTS_PAGE_SIZE = int(os.getenv("EVENTS_PAGE_SIZE", "250"))
+
+    # Local event cache kept in sync with Google Calendar
+    EVENT_CACHE_ENABLED = os.getenv("EVENT_CACHE_ENABLED", "true").lower() == "true"
+    EVENT_CACHE_MAX_STALENESS = float(os.getenv("EVENT_CACHE_MAX_STALENESS", "30"))
+    EVENT_CACHE_LOOKBACK_DAYS = 1
+    EVENT_CACHE_HORIZON_DAYS = 60
+    # Background refresh of the event cache, so chat requests never wait on a sync.
+    # Keep the interval under EVENT_CACHE_MAX_STALENESS.
+    PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+    PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", "20"))
+
+    # Free-slot search
+    WORKING_HOURS_START = os.getenv("WORKING_HOURS_START", "09:00")
+    WORKING_HOURS_END = os.getenv("WORKING_HOURS_END", "17:00")
+    SLOT_GRANULARITY_MINUTES = 15
+    SLOT_BUFFER_MINUTES = 0
+    MAX_SUGGESTED_SLOTS = 6
+
+    # Check-and-book
+    BOOKING_LOCK_TIMEOUT = 10
+    IDEMPOTENCY_MAX_KEYS = 10000
+    IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", str(24 * 60 * 60)))
+    BULK_MAX_EVENTS = int(os.getenv("BULK_MAX_EVENTS", "500"))
+
+    # Cache of agent answers to repeated, self-contained questions
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "120"))
+    # The event store is synced to within this many seconds before a cached answer is looked up,
+    # so a booking made through another worker stops cached answers after at most this long
+    RESPONSE_CACHE_MAX_STALENESS = float(os.getenv("RESPONSE_CACHE_MAX_STALENESS", "5"))
+
+    # Opt-in span trees for chat requests; slow ones go to a rotating file
+    TRACE_ENABLED = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+    TRACE_SLOW_THRESHOLD = float(os.getenv("TRACE_SLOW_THRESHOLD", "10"))
+    TRACE_FILE = os.getenv("TRACE_FILE", "slow_requests.log")
+    TRACE_FILE_MAX_BYTES = 10 * 1024 * 1024
+    TRACE_FILE_BACKUPS = 5
+    # Sampled stacks add a background thread walking every stack 100 times a second
+    TRACE_PROFILE = os.getenv("TRACE_PROFILE", "false").lower() == "true"
+    TRACE_PROFILE_INTERVAL = 0.01
+    TRACE_PROFILE_WINDOW = 120
+    TRACE_PROFILE_MAX_STACKS = 40
 
 
 settings = Settings()
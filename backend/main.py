@@ -1,6 +1,19 @@
+import time
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.api.chat import router as chat_router
+from backend.api.chat import router as chat_router, conversation_service, chat_agent
+from backend.api.events import router as events_router
+from backend.api.metrics import router as metrics_router
+from backend.config import settings
+from backend.services.api_scheduler import PREFETCH, call_priority
+from backend.services.calendar_service import get_calendar_service
+from backend.services.concurrency import run_blocking
+from backend.services.prefetcher import prefetcher
+from backend.services.startup import startup_report
+from contextlib import asynccontextmanager
 import asyncio
 import httpx
 import logging
@@ -13,7 +26,7 @@ logger = logging.getLogger(__name__)
 SERVICE_URL = os.getenv("SERVICE_URL", "https://calendent.onrender.com")
 PING_INTERVAL = 300
 def create_app() -> FastAPI:
-    app = FastAPI(title="Calendar Assistant API", version="1.0.0")
+    app = FastAPI(title="Calendar Assistant API", version="1.0.0", lifespan=lifespan)
     
     app.add_middleware(
         CORSMiddleware,
@@ -24,10 +37,11 @@ def create_app() -> FastAPI:
     )
     
     app.include_router(chat_router, prefix="/api")
+    app.include_router(events_router, prefix="/api")
+    app.include_router(metrics_router)
     
     return app
 
-app = create_app()
 
 async def keep_alive_ping():
     """Background task to ping the service every 14 minutes"""
@@ -41,18 +55,46 @@ async def keep_alive_ping():
         
         await asyncio.sleep(PING_INTERVAL)
 
+async def warmup():
+    """Build the agent and calendar client and fill the event cache in the background"""
+    started = time.perf_counter()
+    try:
+        await run_blocking(chat_agent.get)
+        calendar_service = await run_blocking(get_calendar_service)
+        if calendar_service.available and settings.EVENT_CACHE_ENABLED:
+            with call_priority(PREFETCH):
+                await run_blocking(calendar_service.event_store().ensure_fresh)
+        startup_report.record("warmup", time.perf_counter() - started)
+        logger.info(f"Warmup finished in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        logger.error(f"Warmup failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Background tasks for the life of the app; conversation writes are flushed on the way out"""
+    tasks = [asyncio.create_task(keep_alive_ping())]
+    logger.info("Keep-alive service started")
+    if settings.STARTUP_WARMUP:
+        tasks.append(asyncio.create_task(warmup()))
+    if settings.PREFETCH_ENABLED:
+        tasks.append(asyncio.create_task(prefetcher.run()))
+        logger.info(f"Calendar prefetch every {settings.PREFETCH_INTERVAL:g}s")
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        conversation_service.close()
+
+app = create_app()
+startup_report.record("import.app", time.perf_counter() - _import_started)
+
 @app.get("/")
 async def root():
     return {"message": "Calendar Assistant API is running!", "status": "alive"}
 
-@app.on_event("startup")
-async def startup_event():
-    """Start the keep-alive task when the app starts"""
-    asyncio.create_task(keep_alive_ping())
-    logger.info("Keep-alive service started")
-
 if __name__ == "__main__":
     import uvicorn
-    from backend.config import settings
-    
+
     uvicorn.run(app, host=settings.HOST, port=settings.PORT)
\ No newline at end of file
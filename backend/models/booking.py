@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class EventRequest(BaseModel):
+    title: str
+    date: str
+    start_time: str
+    end_time: str
+    description: Optional[str] = ""
+
+class BulkBookingRequest(BaseModel):
+    events: List[EventRequest]
+
+class BookingResult(BaseModel):
+    index: int
+    status: str
+    event_id: Optional[str] = None
+    error: Optional[str] = None
+    conflicts: List[str] = []
+
+class BulkBookingResponse(BaseModel):
+    booked: int
+    results: List[BookingResult]
@@ -0,0 +1,202 @@
+import contextvars
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, TypeVar
+from googleapiclient.errors import HttpError
+from backend.config import settings
+
+T = TypeVar("T")
+
+# Lower value = served first when calls queue for quota
+BOOKING = 0
+INTERACTIVE = 1
+PREFETCH = 2
+_LANES = {BOOKING: "booking", INTERACTIVE: "interactive", PREFETCH: "prefetch"}
+
+_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("calendar_call_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def call_priority(priority: int):
+    """Run Google calls made inside the block (including on worker threads) in the given lane."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimitedError(Exception):
+    pass
+
+
+def is_retryable(error: Exception) -> bool:
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status == 429 or status >= 500:
+        return True
+    if status == 403:
+        content = error.content.decode("utf-8", "ignore") if isinstance(error.content, bytes) else str(error.content)
+        return any(reason in content for reason in _RATE_LIMIT_REASONS)
+    return False
+
+
+class ApiScheduler:
+    """Token bucket with priority lanes in front of every Google Calendar call.
+
+    Calls take tokens refilled at `rate` per second up to `burst`; when they
+    run out, waiters are served strictly by lane, then arrival. Rate-limit and
+    5xx responses are retried with full-jitter exponential backoff, and each
+    throttle halves the refill rate, which then creeps back up on successes.
+    """
+
+    def __init__(
+        self,
+        rate: float = settings.CALENDAR_QPS,
+        burst: int = settings.CALENDAR_BURST,
+        max_retries: int = settings.CALENDAR_MAX_RETRIES,
+        backoff_base: float = settings.CALENDAR_BACKOFF_BASE,
+        backoff_max: float = settings.CALENDAR_BACKOFF_MAX,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self._lane_stats = {lane: {"calls": 0, "waits": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0} for lane in _LANES}
+
+    def run(self, call: Callable[[], T], cost: int = 1) -> T:
+        priority = _priority.get()
+        attempt = 0
+        while True:
+            self._acquire(priority, min(cost, self.burst))
+            try:
+                result = call()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                self._on_throttled(e)
+                if attempt >= self.max_retries:
+                    with self._condition:
+                        self.failures += 1
+                    raise RateLimitedError(
+                        "Google Calendar is rate limiting or unavailable right now. "
+                        "Don't retry immediately; ask the user to try again in a minute."
+                    ) from e
+                time.sleep(self._backoff(attempt, e))
+                attempt += 1
+                with self._condition:
+                    self.retries += 1
+                continue
+            self._on_success()
+            return result
+
+    def retry_delay(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before the caller retries a throttled call itself, e.g. one request inside a batch."""
+        self._on_throttled(error)
+        with self._condition:
+            self.retries += 1
+        return self._backoff(attempt, error)
+
+    def _acquire(self, priority: int, cost: int):
+        started = time.monotonic()
+        with self._condition:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == ticket:
+                        if self._tokens >= cost:
+                            break
+                        self._condition.wait((cost - self._tokens) / self.rate)
+                    else:
+                        self._condition.wait()
+            except BaseException:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+                raise
+
+            heapq.heappop(self._waiters)
+            self._tokens -= cost
+            # Wake the next head of the queue so it can check the bucket
+            self._condition.notify_all()
+
+            waited = time.monotonic() - started
+            lane = self._lane_stats[priority]
+            lane["calls"] += 1
+            self.calls += 1
+            if waited > 0.001:
+                lane["waits"] += 1
+                lane["wait_seconds"] += waited
+                lane["max_wait_seconds"] = max(lane["max_wait_seconds"], waited)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = error.resp.get("retry-after") if isinstance(error, HttpError) else None
+        if retry_after and str(retry_after).isdigit():
+            return min(self.backoff_max, float(retry_after))
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _on_throttled(self, error: Exception):
+        with self._condition:
+            self.throttled += 1
+            if error.resp.status in (403, 429):
+                self.rate = max(self.max_rate / 16, self.rate / 2)
+
+    def _on_success(self):
+        if self.rate < self.max_rate:
+            with self._condition:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def stats(self) -> Dict:
+        with self._condition:
+            self._refill()
+            return {
+                "rate": round(self.rate, 2),
+                "tokens": round(self._tokens, 2),
+                "queue_depth": self.queue_depth,
+                "calls": self.calls,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "failures": self.failures,
+                "lanes": {name: self._lane_summary(self._lane_stats[priority]) for priority, name in _LANES.items()},
+            }
+
+    @staticmethod
+    def _lane_summary(lane: Dict) -> Dict:
+        return {
+            "calls": lane["calls"],
+            "waits": lane["waits"],
+            "avg_wait_ms": round(lane["wait_seconds"] / lane["waits"] * 1000, 2) if lane["waits"] else 0.0,
+            "max_wait_ms": round(lane["max_wait_seconds"] * 1000, 2),
+        }
+
+
+calendar_scheduler = ApiScheduler()
@@ -0,0 +1,87 @@
+import base64
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from backend.config import settings
+
+
+class BookingLockTimeout(Exception):
+    pass
+
+
+class RangeLockManager:
+    """Per-calendar locks over time ranges.
+
+    Overlapping ranges on the same calendar exclude each other, so a
+    check-then-insert for 14:00-15:00 cannot interleave with another booking
+    touching that hour, while bookings for other hours proceed in parallel.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._held: Dict[str, List[Tuple[datetime, datetime]]] = {}
+
+    @contextmanager
+    def hold(self, calendar_id: str, start: datetime, end: datetime, timeout: float = settings.BOOKING_LOCK_TIMEOUT):
+        interval = (start, end)
+        with self._condition:
+            acquired = self._condition.wait_for(
+                lambda: not any(
+                    start < held_end and held_start < end
+                    for held_start, held_end in self._held.get(calendar_id, [])
+                ),
+                timeout=timeout,
+            )
+            if not acquired:
+                raise BookingLockTimeout(f"Another booking for {start:%H:%M}-{end:%H:%M} is still in progress")
+            self._held.setdefault(calendar_id, []).append(interval)
+        try:
+            yield
+        finally:
+            with self._condition:
+                held = self._held[calendar_id]
+                held.remove(interval)
+                if not held:
+                    del self._held[calendar_id]
+                self._condition.notify_all()
+
+
+class IdempotencyCache:
+    """Remembers the outcome of recent bookings by idempotency key, bounded by size and age."""
+
+    def __init__(self, max_keys: int = settings.IDEMPOTENCY_MAX_KEYS, ttl: float = settings.IDEMPOTENCY_TTL):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: str, value: Dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+
+def event_id_for_key(calendar_id: str, idempotency_key: str) -> str:
+    """Deterministic Calendar event id for an idempotency key.
+
+    Calendar ids must use base32hex characters (a-v, 0-9). Inserting the same
+    id twice fails with 409, so retries stay idempotent across processes.
+    """
+    digest = hashlib.sha256(f"{calendar_id}:{idempotency_key}".encode()).digest()
+    return base64.b32hexencode(digest).decode().rstrip("=").lower()
@@ -0,0 +1,131 @@
+import math
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+# Busy time as integers: minutes since the Unix epoch. IST has had no DST since
+# 1945, so IST wall-clock times are a fixed +330 minutes away and converting
+# needs neither pytz nor a datetime per event.
+
+IST_OFFSET_MINUTES = 330
+MINUTES_PER_DAY = 24 * 60
+IST_TZ = timezone(timedelta(minutes=IST_OFFSET_MINUTES))
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_CLOCK = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(MINUTES_PER_DAY)]
+
+
+def to_minutes(moment: datetime) -> int:
+    """Epoch minutes at or before an aware datetime."""
+    return math.floor(moment.timestamp() / 60)
+
+
+def to_minutes_ceil(moment: datetime) -> int:
+    """Epoch minutes at or after an aware datetime, so a partial minute still counts as busy."""
+    return math.ceil(moment.timestamp() / 60)
+
+
+def parse_minutes(value: str, ceil: bool = False) -> int:
+    """Epoch minutes of an RFC 3339 timestamp such as the API's dateTime fields."""
+    moment = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    return to_minutes_ceil(moment) if ceil else to_minutes(moment)
+
+
+def day_minutes(day: date) -> int:
+    """Epoch minutes of IST midnight starting `day`."""
+    return (day.toordinal() - _EPOCH_ORDINAL) * MINUTES_PER_DAY - IST_OFFSET_MINUTES
+
+
+@lru_cache(maxsize=1024)
+def clock_minutes(hhmm: str) -> int:
+    """Minutes after midnight for "HH:MM"; as strict as strptime(hhmm, "%H:%M")."""
+    hours, _, minutes = hhmm.partition(":")
+    if not (hours.isdigit() and minutes.isdigit() and len(hours) <= 2 and len(minutes) <= 2
+            and int(hours) < 24 and int(minutes) < 60):
+        raise ValueError(f"time data {hhmm!r} does not match format '%H:%M'")
+    return int(hours) * 60 + int(minutes)
+
+
+def ist_minutes(day: date, hhmm: str) -> int:
+    return day_minutes(day) + clock_minutes(hhmm)
+
+
+def ist_clock(minutes: int) -> str:
+    """IST "HH:MM" for epoch minutes; a table lookup."""
+    return _CLOCK[(minutes + IST_OFFSET_MINUTES) % MINUTES_PER_DAY]
+
+
+def ist_datetime(minutes: int) -> datetime:
+    return datetime.fromtimestamp(minutes * 60, IST_TZ)
+
+
+def event_minutes(event: Dict) -> Tuple[int, int]:
+    """(start, end) epoch minutes of an event; all-day events span IST midnights."""
+    start, end = event["start"], event["end"]
+    if "dateTime" in start:
+        return parse_minutes(start["dateTime"]), parse_minutes(end["dateTime"], ceil=True)
+    return day_minutes(date.fromisoformat(start["date"])), day_minutes(date.fromisoformat(end["date"]))
+
+
+class BusyRow(NamedTuple):
+    start: int
+    end: int
+    title: str
+    all_day: bool
+
+
+class BusyIndex:
+    """Immutable columnar snapshot of events, sorted by start.
+
+    Starts and ends live in parallel int64 arrays, titles are interned and
+    each event's dates are parsed exactly once, when the snapshot is built.
+    Overlap queries bisect the starts, looking back by the longest event, so
+    a lookup costs O(log n + k) without an interval tree. The event dicts are
+    kept alongside for callers that need the full event.
+    """
+
+    __slots__ = ("starts", "ends", "titles", "all_day", "blocking", "events", "_max_duration")
+
+    def __init__(self, events: Iterable[Dict] = ()):
+        rows = sorted(((*event_minutes(event), event) for event in events), key=lambda row: row[0])
+        self.starts = array("q", [row[0] for row in rows])
+        self.ends = array("q", [row[1] for row in rows])
+        self.events: List[Dict] = [row[2] for row in rows]
+        self.titles = [sys.intern(event.get("summary") or "Busy") for event in self.events]
+        self.all_day = bytes("dateTime" not in event["start"] for event in self.events)
+        self.blocking = bytes(event.get("transparency") != "transparent" for event in self.events)
+        self._max_duration = max((end - start for start, end in zip(self.starts, self.ends)), default=0)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def indices(self, start: int, end: int) -> List[int]:
+        """Positions of events overlapping [start, end) epoch minutes, in start order."""
+        starts, ends = self.starts, self.ends
+        lo = bisect_left(starts, start - self._max_duration)
+        hi = bisect_left(starts, end, lo)
+        return [index for index in range(lo, hi) if ends[index] > start]
+
+    def overlapping(self, start: datetime, end: datetime) -> Iterator[Dict]:
+        events = self.events
+        for index in self.indices(to_minutes(start), to_minutes_ceil(end)):
+            yield events[index]
+
+    def rows(self, start: int, end: int) -> List[BusyRow]:
+        """(start, end, title, all_day) for every event overlapping [start, end)."""
+        return self.rows_at(self.indices(start, end))
+
+    def rows_at(self, positions: List[int]) -> List[BusyRow]:
+        starts, ends, titles, all_day = self.starts, self.ends, self.titles, self.all_day
+        return [BusyRow(starts[index], ends[index], titles[index], bool(all_day[index])) for index in positions]
+
+    def events_at(self, positions: List[int]) -> List[Dict]:
+        events = self.events
+        return [events[index] for index in positions]
+
+    def busy(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """(start, end) of the blocking events overlapping [start, end), in start order."""
+        starts, ends, blocking = self.starts, self.ends, self.blocking
+        return [(starts[index], ends[index]) for index in self.indices(start, end) if blocking[index]]
@@ -1,78 +1,503 @@
+import logging
+import time
+import uuid
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from datetime import datetime
-from typing import Optional, List, Dict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, Optional, List, Dict, Tuple
+from googleapiclient.errors import HttpError
 from backend.config import settings
+from backend.services.api_scheduler import BOOKING, ApiScheduler, call_priority, calendar_scheduler, is_retryable
+from backend.services.booking_lock import IdempotencyCache, RangeLockManager, event_id_for_key
+from backend.services.busy_index import (
+    BusyIndex, clock_minutes, day_minutes, event_minutes, ist_datetime, ist_minutes, parse_minutes, to_minutes,
+    to_minutes_ceil,
+)
+from backend.services.event_store import EventStore
+from backend.services.slot_finder import Interval
+from backend.services.google_transport import CALENDAR_SCOPES, CalendarServicePool
+from backend.services.metrics import google_api_calls, google_api_seconds
+from backend.services.single_flight import SingleFlight
+from backend.services.startup import Lazy
+from backend.services.tracing import trace_span
+
+logger = logging.getLogger(__name__)
+
+FREEBUSY_MAX_CALENDARS = 50
+BATCH_MAX_REQUESTS = 50
+
+# The tools only read these; everything else in the event resource is dead payload
+EVENT_FIELDS = "id,status,summary,start,end,transparency"
+EVENT_LIST_FIELDS = f"nextPageToken,nextSyncToken,items({EVENT_FIELDS})"
+
+
+def event_body(title: str, date: str, start_time: str, end_time: str, description: str = "") -> Dict:
+    day = datetime.strptime(date, "%Y-%m-%d").date()
+    start_datetime = ist_datetime(ist_minutes(day, start_time))
+    end_datetime = ist_datetime(ist_minutes(day, end_time))
+
+    return {
+        'summary': title,
+        'description': description,
+        'start': {
+            'dateTime': start_datetime.isoformat(),
+            'timeZone': 'Asia/Kolkata',
+        },
+        'end': {
+            'dateTime': end_datetime.isoformat(),
+            'timeZone': 'Asia/Kolkata',
+        },
+    }
 
 
 class CalendarService:
-    def __init__(self):
-        self.service = self._get_calendar_service()
+    def __init__(self, pool: Optional[CalendarServicePool] = None, scheduler: Optional[ApiScheduler] = None):
+        self.pool = pool or self._create_pool()
+        self.scheduler = scheduler or calendar_scheduler
+        self._event_stores: Dict[str, EventStore] = {}
+        self._range_locks = RangeLockManager()
+        self._idempotency = IdempotencyCache()
+        self._event_reads = SingleFlight()
+        self._free_busy_reads = SingleFlight()
+        self._writes = 0
 
-    def _get_calendar_service(self):
+    def _create_pool(self) -> Optional[CalendarServicePool]:
         try:
             credentials = service_account.Credentials.from_service_account_file(
                 settings.GOOGLE_SERVICE_ACCOUNT_FILE,
-                scopes=["https://www.googleapis.com/auth/calendar"],
+                scopes=CALENDAR_SCOPES,
             )
-            return build("calendar", "v3", credentials=credentials)
+            return CalendarServicePool(credentials)
         except Exception as e:
-            print(f"Error initializing calendar service: {e}")
+            logger.error(f"Error initializing calendar service: {e}")
             return None
 
-    def get_events(
-        self, start_datetime: datetime, end_datetime: datetime
-    ) -> List[Dict]:
-        if not self.service:
+    @property
+    def available(self) -> bool:
+        return self.pool is not None
+
+    @property
+    def version(self) -> int:
+        """Changes whenever this process writes to the calendar or a sync brings in outside changes."""
+        store = self._event_stores.get(settings.CALENDAR_ID)
+        return self._writes + (store.version if store else 0)
+
+    def _execute(self, make_request: Callable[[Any], Any], cost: int = 1) -> Any:
+        """Build a request on a pooled service handle and execute it on that handle's connection.
+
+        Every call goes through the quota scheduler first; a handle is only
+        checked out once the call may actually run.
+        """
+        if not self.pool:
             raise Exception("Calendar service not available")
 
-        events_result = (
-            self.service.events()
-            .list(
-                calendarId=settings.CALENDAR_ID,
-                timeMin=start_datetime.isoformat(),
-                timeMax=end_datetime.isoformat(),
-                singleEvents=True,
-                orderBy="startTime",
+        def call():
+            with self.pool.service() as service:
+                request = make_request(service)
+                method = getattr(request, "methodId", None) or "batch"
+                started = time.perf_counter()
+                try:
+                    with trace_span("execute", method=method):
+                        result = request.execute()
+                except HttpError as e:
+                    google_api_calls.labels(method=method, outcome=str(e.resp.status)).inc()
+                    raise
+                except Exception:
+                    google_api_calls.labels(method=method, outcome="exception").inc()
+                    raise
+                finally:
+                    google_api_seconds.labels(method=method).observe(time.perf_counter() - started)
+                google_api_calls.labels(method=method, outcome="ok").inc()
+                return result
+
+        # The outer span includes quota waits and retries; each attempt gets its own execute span
+        with trace_span("google", cost=cost):
+            return self.scheduler.run(call, cost=cost)
+
+    def _written(self):
+        self._writes += 1
+        self.event_store().invalidate()
+        for listener in _write_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.warning(f"Calendar write listener failed: {e}")
+
+    def event_store(self, calendar_id: Optional[str] = None) -> EventStore:
+        calendar_id = calendar_id or settings.CALENDAR_ID
+        store = self._event_stores.get(calendar_id)
+        if store is None:
+            store = self._event_stores.setdefault(
+                calendar_id,
+                EventStore(lambda **params: self._list_events_page(calendar_id, **params)),
+            )
+        return store
+
+    def _list_events_page(self, calendar_id: str, **params) -> Dict:
+        params = {key: value for key, value in params.items() if value is not None}
+        return self._execute(
+            lambda service: service.events().list(
+                calendarId=calendar_id, singleEvents=True, maxResults=2500, fields=EVENT_LIST_FIELDS, **params
             )
-            .execute()
         )
 
-        return events_result.get("items", [])
+    def get_events(
+        self, start_datetime: datetime, end_datetime: datetime, fields: str = EVENT_LIST_FIELDS
+    ) -> List[Dict]:
+        """All events overlapping the window.
+
+        Reads that miss the event store go to Google, and concurrent identical
+        reads share a single in-flight request and its result.
+        """
+        if settings.EVENT_CACHE_ENABLED and self.event_store().covers(start_datetime, end_datetime):
+            return self.event_store().query(start_datetime, end_datetime)
+
+        key = (settings.CALENDAR_ID, start_datetime.isoformat(), end_datetime.isoformat(), fields)
+        return self._event_reads.do(key, lambda: list(self.iter_events(start_datetime, end_datetime, fields=fields)))
+
+    def iter_events(
+        self,
+        start_datetime: datetime,
+        end_datetime: datetime,
+        fields: str = EVENT_LIST_FIELDS,
+        page_size: int = settings.EVENTS_PAGE_SIZE,
+    ) -> Iterator[Dict]:
+        """Events overlapping the window in start order, produced lazily.
+
+        Served from the event store when it covers the window; otherwise pages
+        are requested from Google only as the caller consumes them, so a
+        caller that stops early never fetches the remaining pages.
+        """
+        if settings.EVENT_CACHE_ENABLED:
+            store = self.event_store()
+            if store.covers(start_datetime, end_datetime):
+                yield from store.iter_range(start_datetime, end_datetime)
+                return
+
+        page_token = None
+        while True:
+            events_result = self._execute(
+                lambda service: service.events().list(
+                    calendarId=settings.CALENDAR_ID,
+                    timeMin=start_datetime.isoformat(),
+                    timeMax=end_datetime.isoformat(),
+                    singleEvents=True,
+                    orderBy="startTime",
+                    maxResults=page_size,
+                    fields=fields,
+                    pageToken=page_token,
+                )
+            )
+            yield from events_result.get("items", [])
+            page_token = events_result.get("nextPageToken")
+            if not page_token:
+                return
+
+    def get_busy_intervals(self, start_datetime: datetime, end_datetime: datetime) -> List[Interval]:
+        """Blocking (start, end) intervals in epoch minutes, ready for the slot finder."""
+        if not settings.EVENT_CACHE_ENABLED or not self.event_store().covers(start_datetime, end_datetime):
+            # Outside the local cache, free/busy is far lighter than listing events
+            busy, errors = self.query_free_busy([settings.CALENDAR_ID], start_datetime, end_datetime)
+            if errors:
+                raise Exception(errors[settings.CALENDAR_ID])
+            return busy[settings.CALENDAR_ID]
+
+        return self.event_store().index().busy(to_minutes(start_datetime), to_minutes_ceil(end_datetime))
+
+    def busy_index(self, start_datetime: datetime, end_datetime: datetime) -> BusyIndex:
+        """Events covering the window as a BusyIndex: the event store's snapshot, or one built from a read."""
+        if settings.EVENT_CACHE_ENABLED and self.event_store().covers(start_datetime, end_datetime):
+            return self.event_store().index()
+        return BusyIndex(self.get_events(start_datetime, end_datetime))
+
+    def query_free_busy(
+        self, calendar_ids: List[str], start_datetime: datetime, end_datetime: datetime
+    ) -> Tuple[Dict[str, List[Interval]], Dict[str, str]]:
+        """Busy intervals (epoch minutes) per calendar from freebusy.query, plus calendars that could not be read.
+
+        Calendars are queried FREEBUSY_MAX_CALENDARS at a time, so N attendees
+        cost ceil(N / 50) requests instead of one event listing each.
+        """
+        busy: Dict[str, List[Interval]] = {}
+        errors: Dict[str, str] = {}
+        for offset in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+            chunk = calendar_ids[offset:offset + FREEBUSY_MAX_CALENDARS]
+            body = {
+                "timeMin": start_datetime.isoformat(),
+                "timeMax": end_datetime.isoformat(),
+                "timeZone": "Asia/Kolkata",
+                "items": [{"id": calendar_id} for calendar_id in chunk],
+            }
+            key = (tuple(chunk), body["timeMin"], body["timeMax"])
+            result = self._free_busy_reads.do(
+                key, lambda: self._execute(lambda service: service.freebusy().query(body=body))
+            )
+
+            for calendar_id in chunk:
+                calendar = result.get("calendars", {}).get(calendar_id, {})
+                if calendar.get("errors"):
+                    errors[calendar_id] = ", ".join(error.get("reason", "unknown") for error in calendar["errors"])
+                    continue
+                busy[calendar_id] = [
+                    (parse_minutes(period["start"]), parse_minutes(period["end"], ceil=True))
+                    for period in calendar.get("busy", [])
+                ]
+        return busy, errors
 
     def create_event(self, event_data: Dict) -> Dict:
-        if not self.service:
-            raise Exception("Calendar service not available")
+        with call_priority(BOOKING):
+            created_event = self._execute(
+                lambda service: service.events().insert(calendarId=settings.CALENDAR_ID, body=event_data)
+            )
+        self._written()
+        return created_event
 
-        return (
-            self.service.events()
-            .insert(calendarId=settings.CALENDAR_ID, body=event_data)
-            .execute()
-        )
+    def book_if_free(self, event_data: Dict, idempotency_key: Optional[str] = None) -> Dict:
+        """Insert event_data only if no blocking event overlaps it.
+
+        The conflict check and the insert run under a lock on the event's time
+        range, so two concurrent requests for the same slot cannot both pass
+        the check. With an idempotency_key the event gets a deterministic id,
+        and a retried request returns the original booking instead of a copy.
+
+        Returns {"status": "booked" | "duplicate" | "conflict", "event", "conflicts"}.
+        """
+        calendar_id = settings.CALENDAR_ID
+        if idempotency_key:
+            previous = self._idempotency.get(idempotency_key)
+            if previous is not None:
+                return {"status": "duplicate", "event": previous, "conflicts": []}
+        # A client-chosen id also makes the scheduler's retry of a failed insert safe
+        event_data = {**event_data, "id": event_id_for_key(calendar_id, idempotency_key or uuid.uuid4().hex)}
+
+        start, end = event_minutes(event_data)
+        start_datetime, end_datetime = ist_datetime(start), ist_datetime(end)
+        with call_priority(BOOKING), self._range_locks.hold(calendar_id, start_datetime, end_datetime):
+            # Decide on the latest state, not on a cache that may be seconds old
+            if settings.EVENT_CACHE_ENABLED:
+                self.event_store().invalidate()
+            conflicts = [
+                event
+                for event in self.iter_events(start_datetime, end_datetime)
+                if event.get("transparency") != "transparent"
+            ]
+
+            own = [event for event in conflicts if event.get("id") == event_data["id"]]
+            if own:
+                status, created_event = "duplicate", own[0]
+            elif conflicts:
+                return {"status": "conflict", "event": None, "conflicts": conflicts}
+            else:
+                try:
+                    status, created_event = "booked", self.create_event(event_data)
+                except HttpError as e:
+                    # 409: an earlier request with this key, or a retried attempt of
+                    # this one whose response was lost, already created the event
+                    if e.resp.status != 409:
+                        raise
+                    status = "duplicate" if idempotency_key else "booked"
+                    created_event = self._execute(
+                        lambda service: service.events().get(calendarId=calendar_id, eventId=event_data["id"])
+                    )
+
+        if idempotency_key:
+            self._idempotency.put(idempotency_key, created_event)
+        return {"status": status, "event": created_event, "conflicts": []}
+
+    def create_events_bulk(self, events: List[Dict]) -> List[Dict]:
+        """Book many events with as few round trips as possible; one result per input, in order.
+
+        Events are validated locally, checked against each other and against
+        the calendar in a single pass, and the survivors are inserted through
+        batch requests of up to BATCH_MAX_REQUESTS calls. Each result has a
+        status of "booked", "invalid", "conflict" or "error".
+        """
+        calendar_id = settings.CALENDAR_ID
+        results: List[Dict] = [{"index": index, "status": None, "event": None} for index in range(len(events))]
+        candidates = []
+        for index, event_data in enumerate(events):
+            try:
+                start, end = event_minutes(event_data)
+            except (KeyError, ValueError) as e:
+                results[index].update(status="invalid", error=f"Bad start/end: {e}")
+                continue
+            if end <= start:
+                results[index].update(status="invalid", error="End must be after start")
+                continue
+            candidates.append((start, end, index))
+
+        if not candidates:
+            return results
+
+        candidates.sort()
+        span_start = ist_datetime(candidates[0][0])
+        span_end = ist_datetime(max(end for _, end, _ in candidates))
+        with call_priority(BOOKING), self._range_locks.hold(calendar_id, span_start, span_end):
+            if settings.EVENT_CACHE_ENABLED:
+                self.event_store().invalidate()
+            existing = BusyIndex(
+                event
+                for event in self.iter_events(span_start, span_end)
+                if event.get("transparency") != "transparent"
+            )
+
+            accepted = []
+            last_end, last_index = None, None
+            for start, end, index in candidates:
+                # Sorted by start, so an internal clash can only be with the latest accepted end
+                if last_end is not None and start < last_end:
+                    results[index].update(status="conflict", conflicts=[events[last_index].get("summary", "Busy")])
+                    continue
+                clashes = existing.events_at(existing.indices(start, end))
+                if clashes:
+                    results[index].update(status="conflict", conflicts=[event.get("summary", "Busy") for event in clashes])
+                    continue
+                accepted.append(index)
+                last_end, last_index = end, index
+
+            # Client-chosen ids, as in book_if_free, so a retried batch can't book anything twice
+            bodies = [(index, {**events[index], "id": event_id_for_key(calendar_id, uuid.uuid4().hex)}) for index in accepted]
+            for offset in range(0, len(bodies), BATCH_MAX_REQUESTS):
+                self._insert_batch(bodies[offset:offset + BATCH_MAX_REQUESTS], results)
+
+        if accepted:
+            self._written()
+        return results
+
+    def _insert_batch(self, items: List[Tuple[int, Dict]], results: List[Dict]):
+        """Insert items with one batch request; calls throttled inside it are retried in follow-up batches.
+
+        The scheduler only sees the status of the outer request, so 429, 5xx
+        and rate-limit 403 answers to single calls are retried here.
+        """
+        bodies = dict(items)
+        attempt = 0
+        while items:
+            throttled: List[Tuple[int, Exception]] = []
+
+            def on_response(request_id, response, exception):
+                index = int(request_id)
+                if exception is None:
+                    results[index].update(status="booked", event=response)
+                elif isinstance(exception, HttpError) and exception.resp.status == 409:
+                    # The id is already taken: an earlier attempt of this batch created the event
+                    results[index].update(status="booked", event=bodies[index])
+                elif is_retryable(exception) and attempt < self.scheduler.max_retries:
+                    throttled.append((index, exception))
+                else:
+                    results[index].update(status="error", error=str(exception))
+
+            def make_batch(service):
+                batch = service.new_batch_http_request(callback=on_response)
+                for index, event_data in items:
+                    batch.add(service.events().insert(calendarId=settings.CALENDAR_ID, body=event_data), request_id=str(index))
+                return batch
+
+            try:
+                # Google meters each call inside a batch separately
+                self._execute(make_batch, cost=len(items))
+            except Exception as e:
+                for index, _ in items:
+                    if results[index]["status"] is None:
+                        results[index].update(status="error", error=str(e))
+                return
+            if not throttled:
+                return
+            time.sleep(self.scheduler.retry_delay(attempt, throttled[0][1]))
+            attempt += 1
+            items = [(index, bodies[index]) for index, _ in throttled]
 
     def check_availability(
         self, date: str, start_time: str = "09:00", end_time: str = "17:00"
     ) -> Dict:
+        """Events in one day's window; "busy" has them as BusyRows in epoch minutes for formatting."""
         try:
-            date_obj = datetime.strptime(date, "%Y-%m-%d")
-            start_datetime = datetime.combine(
-                date_obj.date(), datetime.strptime(start_time, "%H:%M").time()
-            )
-            end_datetime = datetime.combine(
-                date_obj.date(), datetime.strptime(end_time, "%H:%M").time()
-            )
+            day = datetime.strptime(date, "%Y-%m-%d").date()
+            window_start = ist_minutes(day, start_time)
+            window_end = ist_minutes(day, end_time)
+            start_datetime, end_datetime = ist_datetime(window_start), ist_datetime(window_end)
 
-            start_datetime = settings.IST.localize(start_datetime)
-            end_datetime = settings.IST.localize(end_datetime)
-
-            events = self.get_events(start_datetime, end_datetime)
+            index = self.busy_index(start_datetime, end_datetime)
+            positions = index.indices(window_start, window_end)
+            events, busy = index.events_at(positions), index.rows_at(positions)
 
             return {
                 "is_free": len(events) == 0,
                 "events": events,
+                "busy": busy,
                 "date": date,
                 "start_time": start_time,
                 "end_time": end_time,
             }
         except Exception as e:
             raise Exception(f"Error checking availability: {str(e)}")
+
+    def check_availability_range(
+        self, start_date: str, end_date: str, start_time: str = "09:00", end_time: str = "17:00"
+    ) -> Dict[str, Dict]:
+        """Per-day availability for an inclusive date range, fetched with a single ranged read.
+
+        Each day carries its "events", the same as BusyRows in "busy", and its
+        "window" as (start, end) epoch minutes.
+        """
+        try:
+            first_day = datetime.strptime(start_date, "%Y-%m-%d").date()
+            last_day = datetime.strptime(end_date, "%Y-%m-%d").date()
+            day_start = clock_minutes(start_time)
+            day_end = clock_minutes(end_time)
+            if last_day < first_day:
+                raise ValueError(f"end date {end_date} is before start date {start_date}")
+
+            index = self.busy_index(
+                ist_datetime(ist_minutes(first_day, start_time)), ist_datetime(ist_minutes(last_day, end_time))
+            )
+
+            days = {}
+            day = first_day
+            while day <= last_day:
+                window_start, window_end = day_minutes(day) + day_start, day_minutes(day) + day_end
+                positions = index.indices(window_start, window_end)
+                days[day.strftime("%Y-%m-%d")] = {
+                    "is_free": len(positions) == 0,
+                    "events": index.events_at(positions),
+                    "busy": index.rows_at(positions),
+                    "window": (window_start, window_end),
+                }
+                day += timedelta(days=1)
+            return days
+        except Exception as e:
+            raise Exception(f"Error checking availability: {str(e)}")
+
+    def stats(self) -> Dict:
+        return {
+            "pool": self.pool.stats() if self.pool else None,
+            "version": self.version,
+            "scheduler": self.scheduler.stats(),
+            "event_stores": {calendar_id: store.stats() for calendar_id, store in self._event_stores.items()},
+            "single_flight": {
+                "events": self._event_reads.stats(),
+                "freebusy": self._free_busy_reads.stats(),
+            },
+        }
+
+
+_calendar_service = Lazy(CalendarService, "calendar_service")
+_write_listeners: List[Callable[[], None]] = []
+
+
+def on_calendar_write(listener: Callable[[], None]):
+    """Call listener (on the writing thread) after every successful write to the calendar."""
+    _write_listeners.append(listener)
+
+
+def get_calendar_service() -> CalendarService:
+    return _calendar_service.get()
+
+
+def calendar_version() -> int:
+    """Calendar data version without forcing the service to be built; nothing has changed before it exists."""
+    return _calendar_service.get().version if _calendar_service.initialized else 0
+
+
+def calendar_service_stats() -> Optional[Dict]:
+    """Stats without forcing the service to be built."""
+    return _calendar_service.get().stats() if _calendar_service.initialized else None
@@ -0,0 +1,94 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, TypeVar
+from backend.config import settings
+
+T = TypeVar("T")
+
+# The Google API client is synchronous; all of its calls run on this bounded
+# pool so they never block the event loop and never exceed the thread budget.
+_calendar_executor = ThreadPoolExecutor(
+    max_workers=settings.CALENDAR_WORKER_THREADS,
+    thread_name_prefix="calendar",
+)
+# Local storage (the conversation store) gets its own threads: calendar workers
+# can sit in quota backoff or lock waits, and context reads and /health must
+# not queue behind them.
+_storage_executor = ThreadPoolExecutor(
+    max_workers=settings.STORAGE_WORKER_THREADS,
+    thread_name_prefix="storage",
+)
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking callable on the calendar worker pool."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_calendar_executor, call)
+
+
+async def run_storage(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking conversation-store call on the storage pool."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(_storage_executor, call)
+
+
+class ServerBusyError(Exception):
+    pass
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests and bounds how many may wait for a slot."""
+
+    def __init__(self, max_concurrency: int, max_queued: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self.waiting >= self.max_queued:
+            self.rejected += 1
+            raise ServerBusyError("Too many requests in progress")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServerBusyError("Timed out waiting for a free worker")
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+            "max_queued": self.max_queued,
+        }
+
+
+chat_limiter = ConcurrencyLimiter(
+    settings.CHAT_MAX_CONCURRENCY,
+    settings.CHAT_MAX_QUEUED,
+    settings.CHAT_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,164 @@
+import re
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from backend.config import settings
+from backend.services.conversation_store import Message
+from backend.services.date_parser import DateParser
+
+_EMOJI_RE = re.compile("[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF\uFE0F\u200D]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_BOOKED_RE = re.compile(r"Booked '(?P<title>[^']*)' on (?P<date>\d{4}-\d{2}-\d{2}) from (?P<start>\d{2}:\d{2}) to (?P<end>\d{2}:\d{2})")
+_ISO_DATE_RE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+
+MAX_FACTS = 8
+MAX_DATES = 6
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count: about four characters per token."""
+    return (len(text) + 3) // 4
+
+
+class _UserContext:
+    __slots__ = ("lines", "line_tokens", "bookings", "dates", "last_timestamp", "rendered", "tokens")
+
+    def __init__(self):
+        self.lines = deque()
+        self.line_tokens = 0
+        self.bookings: "OrderedDict[str, None]" = OrderedDict()
+        self.dates: "OrderedDict[str, None]" = OrderedDict()
+        self.last_timestamp: Optional[float] = None
+        self.rendered: Optional[str] = None
+        self.tokens = 0
+
+
+class ContextBuilder:
+    """Rolling, token-budgeted prompt context per user, updated on append.
+
+    Recent turns are kept as compact lines (emoji stripped, long replies
+    truncated). When the turn window or token budget overflows, the oldest
+    lines are dropped and only their structured facts survive: bookings made
+    and dates discussed. The rendered string is cached until the next append.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = settings.CONTEXT_TOKEN_BUDGET,
+        recent_turns: int = settings.RECENT_MESSAGES_LIMIT,
+        max_users: int = settings.MAX_CONVERSATION_USERS,
+    ):
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.max_users = max_users
+        self._contexts: "OrderedDict[str, _UserContext]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.rebuilds = 0
+
+    def append(self, user_id: str, message: Message):
+        with self._lock:
+            context = self._contexts.get(user_id)
+            if context is None:
+                # Unknown user: the next render() rebuilds from the store
+                return
+            self._contexts.move_to_end(user_id)
+            self._append(context, message)
+
+    def render(self, user_id: str, last_timestamp: Optional[float]) -> Optional[Tuple[str, int]]:
+        """Cached context for user_id, or None if it does not match the store's latest message."""
+        with self._lock:
+            context = self._contexts.get(user_id)
+            if context is None or context.last_timestamp != last_timestamp:
+                return None
+            self._contexts.move_to_end(user_id)
+            return self._render(context)
+
+    def rebuild(self, user_id: str, messages: Iterable[Message]) -> Tuple[str, int]:
+        context = _UserContext()
+        for message in messages:
+            self._append(context, message)
+        with self._lock:
+            self._contexts[user_id] = context
+            self._contexts.move_to_end(user_id)
+            while len(self._contexts) > self.max_users:
+                self._contexts.popitem(last=False)
+            self.rebuilds += 1
+            return self._render(context)
+
+    def forget(self, user_id: str):
+        """Drop user_id's context, e.g. when the store evicts their conversation."""
+        with self._lock:
+            self._contexts.pop(user_id, None)
+
+    def _append(self, context: _UserContext, message: Message):
+        content = _WHITESPACE_RE.sub(" ", _EMOJI_RE.sub("", message.content)).strip()
+        if message.role == "assistant" and len(content) > settings.CONTEXT_MAX_REPLY_CHARS:
+            content = content[:settings.CONTEXT_MAX_REPLY_CHARS].rstrip() + "…"
+        line = f"{message.role}: {content}"
+        context.lines.append((line, estimate_tokens(line), message))
+        context.line_tokens += context.lines[-1][1]
+        context.last_timestamp = message.timestamp
+        context.rendered = None
+
+        while len(context.lines) > self.recent_turns:
+            self._compact_oldest(context)
+
+    def _compact_oldest(self, context: _UserContext):
+        _, tokens, message = context.lines.popleft()
+        context.line_tokens -= tokens
+        for booking in _BOOKED_RE.finditer(message.content):
+            key = f"'{booking['title']}' {booking['date']} {booking['start']}-{booking['end']}"
+            context.bookings[key] = None
+            context.bookings.move_to_end(key)
+        dates = _ISO_DATE_RE.findall(message.content)
+        if message.role == "user":
+            current_date = datetime.fromtimestamp(message.timestamp, settings.IST).strftime("%Y-%m-%d")
+            dates.extend(start for start, _ in DateParser.find_date_spans(message.content, current_date))
+        for date in dates:
+            context.dates[date] = None
+            context.dates.move_to_end(date)
+        while len(context.bookings) > MAX_FACTS:
+            context.bookings.popitem(last=False)
+        while len(context.dates) > MAX_DATES:
+            context.dates.popitem(last=False)
+
+    def _facts_line(self, context: _UserContext) -> str:
+        facts = []
+        if context.bookings:
+            facts.append("booked " + "; ".join(context.bookings))
+        if context.dates:
+            facts.append("dates discussed " + ", ".join(context.dates))
+        return f"Earlier: {' | '.join(facts)}" if facts else ""
+
+    def _render(self, context: _UserContext) -> Tuple[str, int]:
+        self.renders += 1
+        if context.rendered is not None:
+            return context.rendered, context.tokens
+
+        facts = self._facts_line(context)
+        while context.lines and estimate_tokens(facts) + context.line_tokens > self.token_budget:
+            self._compact_oldest(context)
+            facts = self._facts_line(context)
+
+        parts: List[str] = [facts] if facts else []
+        if context.lines:
+            parts.append("Recent conversation:")
+            parts.extend(line for line, _, _ in context.lines)
+        rendered = "\n".join(parts) + "\n" if parts else ""
+        # Facts alone can still exceed a tiny budget; cut rather than overrun it
+        if estimate_tokens(rendered) > self.token_budget:
+            rendered = rendered[:self.token_budget * 4]
+
+        context.rendered = rendered
+        context.tokens = estimate_tokens(rendered)
+        return context.rendered, context.tokens
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "cached_users": len(self._contexts),
+                "renders": self.renders,
+                "rebuilds": self.rebuilds,
+            }
@@ -1,30 +1,52 @@
-from typing import Dict, List
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from backend.config import settings
+from backend.services.context_builder import ContextBuilder
+from backend.services.conversation_store import ConversationStore, Message, create_conversation_store
+
 
 class ConversationService:
-    def __init__(self):
-        self.conversation_history: Dict[str, List[Dict]] = {}
-    
+    def __init__(self, store: Optional[ConversationStore] = None):
+        self.store = store or create_conversation_store()
+        self.context_builder = ContextBuilder()
+        # Contexts live as long as their conversation, so they share the store's user, byte and idle limits
+        self.store.on_evict = self.context_builder.forget
+        self.context_requests = 0
+        self.context_tokens_total = 0
+
     def get_context(self, user_id: str) -> str:
-        if user_id not in self.conversation_history:
-            return ""
-
-        recent_messages = self.conversation_history[user_id][-settings.RECENT_MESSAGES_LIMIT:]
-        context = "Recent conversation:\n"
-        for msg in recent_messages:
-            context += f"{msg['role']}: {msg['content']}\n"
-        return context
-    
+        return self.get_context_with_tokens(user_id)[0]
+
+    def get_context_with_tokens(self, user_id: str) -> Tuple[str, int]:
+        """Prompt context for user_id and its estimated token count."""
+        latest = self.store.recent(user_id, 1)
+        if not latest:
+            return "", 0
+
+        cached = self.context_builder.render(user_id, latest[0].timestamp)
+        if cached is None:
+            # Another worker appended, or this user was never seen here: replay the stored history
+            history = self.store.recent(user_id, settings.MAX_CONVERSATION_HISTORY)
+            cached = self.context_builder.rebuild(user_id, history)
+
+        self.context_requests += 1
+        self.context_tokens_total += cached[1]
+        return cached
+
+    def get_history(self, user_id: str) -> List[Dict]:
+        return [msg.to_dict() for msg in self.store.recent(user_id, settings.MAX_CONVERSATION_HISTORY)]
+
     def update_history(self, user_id: str, role: str, content: str):
-        if user_id not in self.conversation_history:
-            self.conversation_history[user_id] = []
+        message = Message(role, content)
+        self.store.append(user_id, message)
+        self.context_builder.append(user_id, message)
 
-        self.conversation_history[user_id].append({
-            'role': role,
-            'content': content,
-            'timestamp': datetime.now(settings.IST).isoformat()
-        })
+    def stats(self) -> Dict:
+        stats = self.store.stats()
+        stats["context"] = self.context_builder.stats()
+        stats["context"]["avg_tokens"] = (
+            round(self.context_tokens_total / self.context_requests, 1) if self.context_requests else 0
+        )
+        return stats
 
-        if len(self.conversation_history[user_id]) > settings.MAX_CONVERSATION_HISTORY:
-            self.conversation_history[user_id] = self.conversation_history[user_id][-settings.MAX_CONVERSATION_HISTORY:]
+    def close(self):
+        self.store.close()
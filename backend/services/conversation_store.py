@@ -0,0 +1,272 @@
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Message:
+    __slots__ = ("role", "content", "timestamp")
+
+    def __init__(self, role: str, content: str, timestamp: float = None):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    def size(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.content)
+
+    def to_dict(self) -> Dict:
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+
+
+class ConversationStore:
+    """Where conversation messages live; ConversationService only talks to this interface."""
+
+    # Called with the user id whenever the store drops a whole conversation
+    on_evict: Optional[Callable[[str], None]] = None
+
+    def append(self, user_id: str, message: Message):
+        raise NotImplementedError
+
+    def recent(self, user_id: str, limit: int) -> List[Message]:
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        return {}
+
+    def close(self):
+        pass
+
+
+class _Conversation:
+    __slots__ = ("messages", "size", "last_active")
+
+    def __init__(self, max_history: int):
+        # deque(maxlen=...) is a ring buffer: appending drops the oldest message in O(1)
+        self.messages = deque(maxlen=max_history)
+        self.size = 0
+        self.last_active = time.monotonic()
+
+
+class InMemoryConversationStore(ConversationStore):
+    """Per-user message ring buffers with LRU eviction of idle users.
+
+    Conversations are kept in least-recently-used order, so both the TTL sweep
+    and the user/byte caps only ever evict from the front.
+    """
+
+    def __init__(
+        self,
+        max_history: int = settings.MAX_CONVERSATION_HISTORY,
+        max_users: int = settings.MAX_CONVERSATION_USERS,
+        max_bytes: int = settings.MAX_CONVERSATION_BYTES,
+        idle_ttl: float = settings.CONVERSATION_IDLE_TTL,
+    ):
+        self.max_history = max_history
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.resident_bytes = 0
+        self.evicted_users = 0
+
+    def append(self, user_id: str, message: Message):
+        with self._lock:
+            conversation = self._touch(user_id)
+            if conversation is None:
+                conversation = self._conversations[user_id] = _Conversation(self.max_history)
+
+            if len(conversation.messages) == conversation.messages.maxlen:
+                dropped = conversation.messages[0].size()
+                conversation.size -= dropped
+                self.resident_bytes -= dropped
+            conversation.messages.append(message)
+            conversation.size += message.size()
+            self.resident_bytes += message.size()
+
+            self._evict(keep=user_id)
+
+    def recent(self, user_id: str, limit: int) -> List[Message]:
+        with self._lock:
+            conversation = self._touch(user_id)
+            if conversation is None:
+                return []
+            return list(conversation.messages)[-limit:]
+
+    def _touch(self, user_id: str):
+        conversation = self._conversations.get(user_id)
+        if conversation is not None:
+            conversation.last_active = time.monotonic()
+            self._conversations.move_to_end(user_id)
+        return conversation
+
+    def _evict(self, keep: str):
+        idle_before = time.monotonic() - self.idle_ttl
+        while self._conversations:
+            user_id, oldest = next(iter(self._conversations.items()))
+            over_limit = (
+                len(self._conversations) > self.max_users
+                or self.resident_bytes > self.max_bytes
+                or oldest.last_active < idle_before
+            )
+            if user_id == keep or not over_limit:
+                break
+            del self._conversations[user_id]
+            self.resident_bytes -= oldest.size
+            self.evicted_users += 1
+            if self.on_evict is not None:
+                self.on_evict(user_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "resident_users": len(self._conversations),
+                "resident_bytes": self.resident_bytes,
+                "evicted_users": self.evicted_users,
+            }
+
+
+class SQLiteConversationStore(ConversationStore):
+    """Conversations in a local SQLite database shared by every worker process.
+
+    WAL mode lets readers in other workers proceed while one writes. Appends
+    are buffered and written in one transaction per batch: when the buffer
+    fills, when a reader needs the data, or every flush_interval seconds from
+    a background thread. Each flush trims the touched users back to
+    max_history rows.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.CONVERSATION_DB_PATH,
+        max_history: int = settings.MAX_CONVERSATION_HISTORY,
+        batch_size: int = settings.CONVERSATION_BATCH_SIZE,
+        flush_interval: float = settings.CONVERSATION_FLUSH_INTERVAL,
+        busy_timeout: float = settings.CONVERSATION_BUSY_TIMEOUT,
+    ):
+        self.max_history = max_history
+        self.batch_size = batch_size
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=busy_timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "user_id TEXT NOT NULL, "
+            "role TEXT NOT NULL, "
+            "content TEXT NOT NULL, "
+            "timestamp REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_user ON messages (user_id, id)")
+        self.flushes = 0
+
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,), name="conversation-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def append(self, user_id: str, message: Message):
+        with self._lock:
+            self._pending.append((user_id, message.role, message.content, message.timestamp))
+            if len(self._pending) >= self.batch_size:
+                self._try_flush_locked()
+
+    def recent(self, user_id: str, limit: int) -> List[Message]:
+        with self._lock:
+            flushed = self._try_flush_locked()
+            try:
+                rows = self._conn.execute(
+                    "SELECT role, content, timestamp FROM messages WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                    (user_id, limit),
+                ).fetchall()[::-1]
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Conversation read failed, answering without stored history: {e}")
+                rows = []
+            if not flushed:
+                # WAL readers don't wait for the writer, so stored rows plus the still-buffered ones are current
+                rows += [row[1:] for row in self._pending if row[0] == user_id]
+        return [Message(role, content, timestamp) for role, content, timestamp in rows[-limit:]]
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _try_flush_locked(self) -> bool:
+        """Flush, but leave the batch buffered when another worker holds the write lock too long."""
+        try:
+            self._flush_locked()
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Conversation flush postponed, {len(self._pending)} messages still buffered: {e}")
+            return False
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        users = {row[0] for row in batch}
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT INTO messages (user_id, role, content, timestamp) VALUES (?, ?, ?, ?)", batch
+            )
+            for user_id in users:
+                self._conn.execute(
+                    "DELETE FROM messages WHERE user_id = ? AND id <= ("
+                    "SELECT id FROM messages WHERE user_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (user_id, user_id, self.max_history),
+                )
+            self._conn.execute("COMMIT")
+            self.flushes += 1
+        except sqlite3.Error:
+            # Requeue first: a failed BEGIN IMMEDIATE leaves no transaction to roll back
+            self._pending = batch + self._pending
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+
+    def _flush_periodically(self, interval: float):
+        while not self._closed.wait(interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Conversation flush failed: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            users, rows = self._conn.execute(
+                "SELECT COUNT(DISTINCT user_id), COUNT(*) FROM messages"
+            ).fetchone()
+            return {
+                "backend": "sqlite",
+                "resident_users": users,
+                "stored_messages": rows,
+                "pending_writes": len(self._pending),
+                "flushes": self.flushes,
+            }
+
+    def close(self):
+        self._closed.set()
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def create_conversation_store() -> ConversationStore:
+    if settings.CONVERSATION_BACKEND == "sqlite":
+        return SQLiteConversationStore()
+    if settings.CONVERSATION_BACKEND != "memory":
+        raise ValueError(f"Unknown CONVERSATION_BACKEND: {settings.CONVERSATION_BACKEND}")
+    return InMemoryConversationStore()
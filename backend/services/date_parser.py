@@ -1,102 +1,304 @@
 import re
-from datetime import datetime
-from typing import Dict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+_WEEKDAYS = {
+    "mon": 0, "monday": 0,
+    "tue": 1, "tues": 1, "tuesday": 1,
+    "wed": 2, "wednesday": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3,
+    "fri": 4, "friday": 4,
+    "sat": 5, "saturday": 5,
+    "sun": 6, "sunday": 6,
+}
+# Abbreviations that are also ordinary words ("I sat down", "c'mon"): they only
+# count after this/next/coming/on or as part of a range such as "mon-wed"
+_AMBIGUOUS_WEEKDAYS = {"mon", "wed", "sat", "sun"}
+_MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+_NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7}
+
+_WEEKDAY = r"(?:" + "|".join(sorted(_WEEKDAYS, key=len, reverse=True)) + r")"
+_MONTH = r"(?:" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")"
+_ORD = r"(?:st|nd|rd|th)?"
+
+# One alternation scanned left to right; longer forms come first so "july 4-6"
+# wins over "july 4" and "day after tomorrow" over "tomorrow".
+_DATE_RE = re.compile(
+    rf"\b(?:"
+    rf"(?P<md_range>(?P<mdr_month>{_MONTH})\s+(?P<mdr_from>\d{{1,2}}){_ORD}\s*(?:-|to|–)\s*(?P<mdr_to>\d{{1,2}}){_ORD}(?:,?\s+(?P<mdr_year>\d{{4}}))?)"
+    rf"|(?P<dm_range>(?P<dmr_from>\d{{1,2}}){_ORD}\s*(?:-|to|–)\s*(?P<dmr_to>\d{{1,2}}){_ORD}\s+(?:of\s+)?(?P<dmr_month>{_MONTH})(?:,?\s+(?P<dmr_year>\d{{4}}))?)"
+    rf"|(?P<iso>(?P<iso_year>\d{{4}})-(?P<iso_month>\d{{1,2}})-(?P<iso_day>\d{{1,2}}))"
+    rf"|(?P<day_month>(?P<dm_day>\d{{1,2}}){_ORD}\s+(?:of\s+)?(?P<dm_month>{_MONTH})(?:,?\s+(?P<dm_year>\d{{4}}))?)"
+    rf"|(?P<month_day>(?P<md_month>{_MONTH})\s+(?P<md_day>\d{{1,2}}){_ORD}(?:,?\s+(?P<md_year>\d{{4}}))?)"
+    # Not a fraction: "1/2 hour", "3/4 of the slots"
+    rf"|(?P<numeric>(?P<num_day>\d{{1,2}})/(?P<num_month>\d{{1,2}})(?:/(?P<num_year>\d{{2}}|\d{{4}}))?"
+    rf"(?!\s*(?:hours?|hrs?|minutes?|mins?|of)\b))"
+    rf"|(?P<relative>day after tomorrow|today|tonight|tomorrow|tmrw|tmr|yesterday)"
+    rf"|(?P<offset>in\s+(?P<off_n>\d+|an?|one|two|three|four|five|six|seven)\s+(?P<off_unit>days?|weeks?))"
+    rf"|(?P<week>(?P<week_mod>this|next|coming)?\s*(?P<week_kind>weekend|week))"
+    rf"|(?P<weekday>(?:(?P<wd_mod>this|next|coming|on)\s+)?(?P<wd_name>{_WEEKDAY}))"
+    rf")\b"
+)
+_RANGE_JOIN_RE = re.compile(r"^\s*(?:to|until|till|through|thru|-|–)\s*$")
+_BETWEEN_JOIN_RE = re.compile(r"^\s*and\s*$")
+_BETWEEN_RE = re.compile(r"\b(?:between|from)\s*$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_MERIDIEM = r'[ap]\.?m\b\.?'
+# (pattern, explicit): explicit patterns pin down a clock time; a bare "2-3" could be anything
+_TIME_PATTERNS = [
+    # 2 PM to 3:30 PM
+    (re.compile(rf'\b(\d{{1,2}}(?::\d{{2}})?\s*{_MERIDIEM})\s*(?:to|-|until)\s*(\d{{1,2}}(?::\d{{2}})?\s*{_MERIDIEM})'), True),
+    # 2-3 PM, 2 to 3:30 PM: the start shares the end's meridiem
+    (re.compile(rf'\b(\d{{1,2}}(?::\d{{2}})?)\s*(?:to|-|until)\s*(\d{{1,2}}(?::\d{{2}})?\s*{_MERIDIEM})'), True),
+    # Single time (2 PM) - assume 1 hour duration
+    (re.compile(rf'\b(\d{{1,2}}(?::\d{{2}})?\s*{_MERIDIEM})'), True),
+    # 24-hour format (14:00-15:30)
+    (re.compile(r'\b(\d{1,2}:\d{2})\s*(?:to|-|until)\s*(\d{1,2}:\d{2})\b'), True),
+    # Single 24-hour time (at 14:30) - assume 1 hour duration
+    (re.compile(r'\b(\d{1,2}:\d{2})\b'), True),
+    # Time ranges without meridiem (2-3)
+    (re.compile(r'(?<![\d/-])\b(\d{1,2})\s*(?:to|-)\s*(\d{1,2})\b(?![/-])'), False),
+]
+_PERIOD_MAPPINGS = {
+    'morning': ('09:00', '11:00'),
+    'afternoon': ('13:00', '16:00'),
+    'evening': ('17:00', '19:00'),
+    'night': ('20:00', '22:00'),
+    'lunch': ('12:00', '13:00')
+}
+_DIGIT_RE = re.compile(r'\d')
+_TIME_24H_RE = re.compile(r'\d{2}:\d{2}')
+_TIME_12H_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(?:([ap])\.?m?\.?)?', re.IGNORECASE)
+_CLOCK_RE = re.compile(r'(?:[01]\d|2[0-3]):[0-5]\d')
+
+DateSpan = Tuple[str, str]
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text.lower().replace("’", "'")).strip()
+
+
+def _with_year(today: date, month: int, day: int, year: Optional[str]) -> date:
+    if year:
+        return date(int(year) + (2000 if len(year) == 2 else 0), month, day)
+    candidate = date(today.year, month, day)
+    # A bare "4 July" that has already passed this year means next year's
+    return candidate if candidate >= today else date(today.year + 1, month, day)
+
+
+def _resolve(match: "re.Match", today: date) -> Optional[Tuple[date, date]]:
+    g = match.groupdict()
+    if g["md_range"]:
+        month = _MONTHS[g["mdr_month"]]
+        return _with_year(today, month, int(g["mdr_from"]), g["mdr_year"]), _with_year(today, month, int(g["mdr_to"]), g["mdr_year"])
+    if g["dm_range"]:
+        month = _MONTHS[g["dmr_month"]]
+        return _with_year(today, month, int(g["dmr_from"]), g["dmr_year"]), _with_year(today, month, int(g["dmr_to"]), g["dmr_year"])
+    if g["iso"]:
+        day = date(int(g["iso_year"]), int(g["iso_month"]), int(g["iso_day"]))
+        return day, day
+    if g["day_month"]:
+        day = _with_year(today, _MONTHS[g["dm_month"]], int(g["dm_day"]), g["dm_year"])
+        return day, day
+    if g["month_day"]:
+        day = _with_year(today, _MONTHS[g["md_month"]], int(g["md_day"]), g["md_year"])
+        return day, day
+    if g["numeric"]:
+        # Day-first, as written in India
+        day = _with_year(today, int(g["num_month"]), int(g["num_day"]), g["num_year"])
+        return day, day
+    if g["relative"]:
+        offset = {"yesterday": -1, "today": 0, "tonight": 0, "day after tomorrow": 2}.get(g["relative"], 1)
+        day = today + timedelta(days=offset)
+        return day, day
+    if g["offset"]:
+        amount = _NUMBER_WORDS.get(g["off_n"]) or int(g["off_n"])
+        day = today + timedelta(days=amount * (7 if g["off_unit"].startswith("week") else 1))
+        return day, day
+    if g["week"]:
+        week_start = today - timedelta(days=today.weekday())
+        if g["week_mod"] in ("next", "coming"):
+            week_start += timedelta(days=7)
+        if g["week_kind"] == "weekend":
+            saturday = week_start + timedelta(days=5)
+            return max(saturday, today), week_start + timedelta(days=6)
+        return max(week_start, today), week_start + timedelta(days=6)
+    if g["weekday"]:
+        target = _WEEKDAYS[g["wd_name"]]
+        if g["wd_mod"] == "next":
+            next_week_start = today - timedelta(days=today.weekday()) + timedelta(days=7)
+            day = next_week_start + timedelta(days=target)
+        else:
+            day = today + timedelta(days=(target - today.weekday()) % 7)
+        return day, day
+    return None
+
+
+@lru_cache(maxsize=2048)
+def _scan(normalized: str, current_date: str) -> Tuple[DateSpan, ...]:
+    today = datetime.strptime(current_date, "%Y-%m-%d").date()
+    spans: List[list] = []
+    for match in _DATE_RE.finditer(normalized):
+        try:
+            resolved = _resolve(match, today)
+        except ValueError:
+            # Impossible calendar dates such as 31/02
+            continue
+        if resolved is None:
+            continue
+        start, end = resolved
+        if spans:
+            previous = spans[-1]
+            between = normalized[previous[3]:match.start()]
+            joins = _RANGE_JOIN_RE.match(between) or (
+                _BETWEEN_JOIN_RE.match(between) and _BETWEEN_RE.search(normalized[:previous[2]])
+            )
+            if joins:
+                if end < previous[0] and match.group("weekday"):
+                    end += timedelta(days=7)
+                if end >= previous[0]:
+                    previous[1] = end
+                    previous[3] = match.end()
+                    previous[4] = False
+                    continue
+        # A bare "sat" or "mon" is kept only if the next date joins it into a range
+        tentative = match.group("wd_name") in _AMBIGUOUS_WEEKDAYS and not match.group("wd_mod")
+        spans.append([start, end, match.start(), match.end(), tentative])
+
+    return tuple(
+        (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")) for start, end, _, _, tentative in spans if not tentative
+    )
+
+
+def _shared_meridiem(start: str, end: str) -> str:
+    """"2" in "2-3 pm" takes the end's meridiem, unless that puts it after the end ("11-1 pm")."""
+    end_time = DateParser._normalize_time(end)
+    meridiem = _TIME_12H_RE.fullmatch(end).group(3)
+    start_time = DateParser._normalize_time(f"{start} {meridiem}m")
+    if start_time >= end_time:
+        start_time = DateParser._normalize_time(f"{start} {'a' if meridiem.lower() == 'p' else 'p'}m")
+    return start_time
+
+
+@lru_cache(maxsize=2048)
+def _extract_time(text_lower: str) -> Tuple[str, str, bool]:
+    """(start, end, explicit): explicit is False when the times come from a period word, a bare range or the default."""
+    # Every numeric pattern needs a digit; skip straight to the period words otherwise
+    if _DIGIT_RE.search(text_lower):
+        for pattern, explicit in _TIME_PATTERNS:
+            match = pattern.search(text_lower)
+            if not match:
+                continue
+            groups = [group.strip() for group in match.groups()]
+            if len(groups) == 2:
+                start, end = groups
+                end_time = DateParser._normalize_time(end)
+                if _TIME_12H_RE.fullmatch(start).group(3) is None and _TIME_12H_RE.fullmatch(end).group(3):
+                    start_time = _shared_meridiem(start, end)
+                else:
+                    start_time = DateParser._normalize_time(start)
+            else:
+                start_time = DateParser._normalize_time(groups[0])
+                end_time = DateParser._add_hours(start_time) if _CLOCK_RE.fullmatch(start_time) else start_time
+            # "25:00" or "13:75" is no time at all
+            if _CLOCK_RE.fullmatch(start_time) and _CLOCK_RE.fullmatch(end_time):
+                return start_time, end_time, explicit
+            break
+
+    for period, times in _PERIOD_MAPPINGS.items():
+        if period in text_lower:
+            return times[0], times[1], False
+
+    return '09:00', '10:00', False
+
 
 class DateParser:
     @staticmethod
-    def parse_natural_date(text: str, current_date: str) -> str:
-        # Existing implementation remains unchanged
-        ...
+    def parse_natural_date(text: str, current_date: str) -> Optional[str]:
+        """
+        Resolves the first date mentioned in text to YYYY-MM-DD, relative to current_date.
+        Understands today/tomorrow, weekdays ("Friday", "next Tuesday"), "in 3 days",
+        "this/next week", explicit dates (2025-07-04, 4/7, 4th July, July 4) and ranges,
+        for which the first day is returned. Returns None when no date is found.
+        """
+        spans = _scan(_normalize(text), current_date)
+        return spans[0][0] if spans else None
+
+    @staticmethod
+    def parse_date_range(text: str, current_date: str) -> Optional[DateSpan]:
+        """Returns the first (start, end) date span in text; single days have start == end."""
+        spans = _scan(_normalize(text), current_date)
+        return spans[0] if spans else None
+
+    @staticmethod
+    def find_date_spans(text: str, current_date: str) -> List[DateSpan]:
+        """Returns every (start, end) date span mentioned in text, in order."""
+        return list(_scan(_normalize(text), current_date))
+
+    @staticmethod
+    def cache_info():
+        return _scan.cache_info()
 
     @staticmethod
     def extract_time_from_text(text: str) -> Dict[str, str]:
         """
         Extracts start_time and end_time from natural language text using regex patterns.
         Handles various formats:
-        - 2 PM, 2:30 PM, 14:00
-        - 2-3 PM, 2 to 3:30 PM
+        - 2 PM, 2:30 PM, 14:00, at 14:30
+        - 2-3 PM, 2 to 3:30 PM, 10:30 PM to 11:30 PM, 14:00-15:30
         - morning (9-11), afternoon (1-4), evening (5-7)
         - defaults to 09:00-10:00 if no time found
         """
-        text_lower = text.lower()
-        
-        # Regex patterns for time extraction
-        time_patterns = [
-            # 2 PM to 3:30 PM
-            r'(\d{1,2}(?::\d{2})?\s*[ap]m?)\s*(?:to|-|until)\s*(\d{1,2}(?::\d{2})?\s*[ap]m?)',
-            # 2-3:30 PM
-            r'(\d{1,2}(?::\d{2})?)\s*-\s*(\d{1,2}:\d{2}\s*[ap]m?)',
-            # Single time (2 PM) - assume 1 hour duration
-            r'(\d{1,2}(?::\d{2})?\s*[ap]m?)\b',
-            # 24-hour format (14:00-15:30)
-            r'(\d{2}:\d{2})\s*(?:to|-)\s*(\d{2}:\d{2})',
-            # Time ranges without meridiem (2-3)
-            r'\b(\d{1,2})\s*(?:to|-)\s*(\d{1,2})\b'
-        ]
-
-        # Time period mappings
-        period_mappings = {
-            'morning': ('09:00', '11:00'),
-            'afternoon': ('13:00', '16:00'),
-            'evening': ('17:00', '19:00'),
-            'night': ('20:00', '22:00'),
-            'lunch': ('12:00', '13:00')
+        start_time, end_time, _ = _extract_time(text.lower())
+        return {
+            'start_time': start_time,
+            'end_time': end_time
         }
 
-        # Try to match time patterns
-        for pattern in time_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                groups = match.groups()
-                if len(groups) == 2:
-                    start, end = groups
-                    return {
-                        'start_time': DateParser._normalize_time(start.strip()),
-                        'end_time': DateParser._normalize_time(end.strip())
-                    }
-                elif len(groups) == 1:
-                    start = groups[0]
-                    return {
-                        'start_time': DateParser._normalize_time(start.strip()),
-                        'end_time': DateParser._add_hours(start.strip())
-                    }
-
-        # Check for time periods (morning/afternoon/evening)
-        for period, times in period_mappings.items():
-            if period in text_lower:
-                return {
-                    'start_time': times[0],
-                    'end_time': times[1]
-                }
-
-        # Default values if no time found
+    @staticmethod
+    def match_time(text: str) -> Optional[Dict[str, str]]:
+        """Like extract_time_from_text, but None unless the text spells out a clock time or range.
+
+        Period words ("afternoon"), bare ranges ("2-3") and the 09:00 default
+        don't count, so callers can tell a parsed time from a guessed one.
+        """
+        start_time, end_time, explicit = _extract_time(text.lower())
+        if not explicit:
+            return None
         return {
-            'start_time': '09:00',
-            'end_time': '10:00'
+            'start_time': start_time,
+            'end_time': end_time
         }
 
     @staticmethod
     def _normalize_time(time_str: str) -> str:
         """Convert various time formats to HH:MM format"""
         # Handle 24-hour format
-        if re.match(r'\d{2}:\d{2}', time_str):
+        if _TIME_24H_RE.fullmatch(time_str):
             return time_str
-        
+
         # Handle 12-hour format
-        time_match = re.match(r'(\d{1,2})(?::(\d{2}))?\s*([ap]m?)?', time_str, re.IGNORECASE)
+        time_match = _TIME_12H_RE.fullmatch(time_str)
         if not time_match:
             return '09:00'
-        
+
         hour = int(time_match.group(1))
         minute = time_match.group(2) or '00'
         meridiem = time_match.group(3) or ''
-        
+
         # Convert to 24-hour format
         if meridiem.lower().startswith('p') and hour < 12:
             hour += 12
         elif meridiem.lower().startswith('a') and hour == 12:
             hour = 0
-        
+
         return f"{hour:02d}:{minute}"
 
     @staticmethod
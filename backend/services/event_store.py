@@ -0,0 +1,138 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from googleapiclient.errors import HttpError
+from backend.config import settings
+from backend.services.busy_index import BusyIndex
+
+
+class EventStore:
+    """Local copy of one calendar, warmed by a full sync and kept current with syncToken syncs."""
+
+    def __init__(self, list_page: Callable[..., Dict], max_staleness: float = settings.EVENT_CACHE_MAX_STALENESS):
+        self._list_page = list_page
+        self.max_staleness = max_staleness
+        self._events: Dict[str, Dict] = {}
+        self._index = BusyIndex()
+        self._sync_token: Optional[str] = None
+        self._window: Optional[Tuple[datetime, datetime]] = None
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        # Bumped whenever a sync changes what the store holds
+        self.version = 0
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        window = self._window
+        if window is None:
+            window = self._full_window()
+        return window[0] <= start and end <= window[1]
+
+    def query(self, start: datetime, end: datetime) -> List[Dict]:
+        """Events overlapping [start, end), ordered by start time, at most max_staleness old."""
+        return list(self.iter_range(start, end))
+
+    def iter_range(self, start: datetime, end: datetime) -> Iterator[Dict]:
+        return self.index().overlapping(start, end)
+
+    def index(self) -> BusyIndex:
+        """The current snapshot, at most max_staleness old; safe to keep using after later syncs."""
+        self.ensure_fresh()
+        return self._index
+
+    def ensure_fresh(self, max_staleness: Optional[float] = None):
+        if max_staleness is None:
+            max_staleness = self.max_staleness
+        if time.monotonic() - self._synced_at <= max_staleness:
+            return
+        with self._lock:
+            if time.monotonic() - self._synced_at <= max_staleness:
+                return
+            self._sync()
+
+    def invalidate(self):
+        self._synced_at = 0.0
+
+    def _full_window(self) -> Tuple[datetime, datetime]:
+        today = settings.IST.localize(
+            datetime.combine(datetime.now(settings.IST).date(), datetime.min.time())
+        )
+        return (
+            today - timedelta(days=settings.EVENT_CACHE_LOOKBACK_DAYS),
+            today + timedelta(days=settings.EVENT_CACHE_HORIZON_DAYS),
+        )
+
+    def _sync(self):
+        # The window rolls forward daily; once it moves, re-anchor with a full sync
+        if self._sync_token and self._window == self._full_window():
+            try:
+                self._incremental_sync()
+                return
+            except HttpError as e:
+                # 410 Gone: the sync token expired and a full sync is required
+                if e.resp.status != 410:
+                    raise
+        self._full_sync()
+
+    def _full_sync(self):
+        window = self._full_window()
+        events: Dict[str, Dict] = {}
+        sync_token = None
+        page_token = None
+        while True:
+            page = self._list_page(
+                timeMin=window[0].isoformat(),
+                timeMax=window[1].isoformat(),
+                pageToken=page_token,
+            )
+            for event in page.get("items", []):
+                if event.get("status") != "cancelled":
+                    events[event["id"]] = event
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                sync_token = page.get("nextSyncToken")
+                break
+
+        self._events = events
+        self._index = BusyIndex(events.values())
+        self._sync_token = sync_token
+        self._window = window
+        self._synced_at = time.monotonic()
+        self.full_syncs += 1
+        self.version += 1
+
+    def _incremental_sync(self):
+        events = dict(self._events)
+        changed = False
+        page_token = None
+        while True:
+            page = self._list_page(syncToken=self._sync_token, pageToken=page_token)
+            for event in page.get("items", []):
+                changed = True
+                if event.get("status") == "cancelled":
+                    events.pop(event["id"], None)
+                else:
+                    events[event["id"]] = event
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                sync_token = page.get("nextSyncToken")
+                break
+
+        if changed:
+            self._events = events
+            self._index = BusyIndex(events.values())
+            self.version += 1
+        self._sync_token = sync_token
+        self._synced_at = time.monotonic()
+        self.incremental_syncs += 1
+
+    def stats(self) -> Dict:
+        return {
+            "events": len(self._index),
+            "age_seconds": round(time.monotonic() - self._synced_at, 1) if self._synced_at else None,
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "version": self.version,
+        }
@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict
+import httplib2
+import google_auth_httplib2
+from backend.config import settings
+
+CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+
+class PoolExhaustedError(Exception):
+    pass
+
+
+class CalendarServicePool:
+    """Pool of Calendar API handles, each with its own authorized keep-alive connection.
+
+    httplib2.Http is not thread-safe, so a handle is only ever used by one
+    thread at a time. Handles are created on demand up to `size` and reused
+    LIFO so the warmest connections stay busy. All handles share one
+    credentials object whose token is refreshed under a lock.
+    """
+
+    def __init__(
+        self,
+        credentials,
+        size: int = settings.CALENDAR_POOL_SIZE,
+        http_timeout: float = settings.CALENDAR_HTTP_TIMEOUT,
+        acquire_timeout: float = settings.CALENDAR_POOL_ACQUIRE_TIMEOUT,
+    ):
+        self._credentials = credentials
+        self.size = size
+        self._http_timeout = http_timeout
+        self._acquire_timeout = acquire_timeout
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.created = 0
+        self.in_use = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.token_refreshes = 0
+
+    @contextmanager
+    def service(self):
+        handle = self._acquire()
+        try:
+            self._ensure_token()
+            yield handle
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._idle.put(handle)
+
+    def _acquire(self):
+        create = False
+        try:
+            handle = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self.created < self.size:
+                    self.created += 1
+                    create = True
+            if create:
+                try:
+                    handle = self._create_handle()
+                except Exception:
+                    with self._lock:
+                        self.created -= 1
+                    raise
+            else:
+                started = time.perf_counter()
+                try:
+                    handle = self._idle.get(timeout=self._acquire_timeout)
+                except queue.Empty:
+                    raise PoolExhaustedError("No Google Calendar connection became free in time")
+                finally:
+                    with self._lock:
+                        self.waits += 1
+                        self.wait_seconds += time.perf_counter() - started
+        with self._lock:
+            self.in_use += 1
+        return handle
+
+    def _create_handle(self):
+        from googleapiclient.discovery import build
+
+        http = google_auth_httplib2.AuthorizedHttp(
+            self._credentials, http=httplib2.Http(timeout=self._http_timeout)
+        )
+        return build("calendar", "v3", http=http, static_discovery=True, cache_discovery=False)
+
+    def _ensure_token(self):
+        # Refresh once for everyone instead of letting each connection race to do it
+        if self._credentials.valid:
+            return
+        with self._refresh_lock:
+            if not self._credentials.valid:
+                self._credentials.refresh(google_auth_httplib2.Request(httplib2.Http(timeout=self._http_timeout)))
+                self.token_refreshes += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self.created,
+                "in_use": self.in_use,
+                "idle": self._idle.qsize(),
+                "waits": self.waits,
+                "avg_wait_ms": round(self.wait_seconds / self.waits * 1000, 2) if self.waits else 0.0,
+                "token_refreshes": self.token_refreshes,
+            }
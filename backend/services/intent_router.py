@@ -0,0 +1,181 @@
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+from backend.services.busy_index import MINUTES_PER_DAY, clock_minutes, day_minutes, ist_clock, ist_datetime, ist_minutes
+from backend.services.date_parser import DateParser
+from backend.services.slot_finder import find_free_slots
+from backend.services.calendar_service import get_calendar_service
+from backend.tools.calendar_tools import (
+    book_if_free,
+    get_calendar_availability,
+    get_range_availability,
+)
+
+logger = logging.getLogger(__name__)
+
+_AMBIGUOUS_RE = re.compile(
+    r"\b(not|don'?t|no|except|unless|if|but|or|cancel|delete|remove|move|reschedule|"
+    r"instead|with|every|each|recurring|again|also|and then)\b"
+)
+_SCHEDULE_RE = re.compile(
+    r"^(what'?s|what is|what are|show( me)?|list|get)\b.*\b(schedule|agenda|calendar|events|meetings|plans)\b"
+)
+_AVAILABILITY_RE = re.compile(
+    r"^(what'?s|what is|show( me)?|check|am i|is)\b.*\b(availability|available|free|busy)\b"
+)
+_BOOKING_RE = re.compile(r"^(please\s+)?(book|schedule|set up|arrange)\s+(?P<rest>.+)$")
+_DURATION_RE = re.compile(r"\b(\d{1,3})\s*-?\s*(minutes?|mins?|hours?|hrs?)\b")
+_TIME_RE = re.compile(r"\b\d{1,2}(:\d{2})?\s*(am|pm|a\.m|p\.m)\b|\b\d{1,2}:\d{2}\b")
+_LOOSE_TIME_RE = re.compile(r"\b(at|by|from|until|till|around|before|after)\s+\d|\b\d{1,2}\s*(-|to)\s*\d{1,2}\b|o'?clock")
+_PERIOD_RE = re.compile(r"\b(morning|afternoon|evening|lunch)\b")
+# The title is whatever precedes the first date, time or preposition
+_TITLE_END_RE = re.compile(
+    r"\b(?:today|tonight|tomorrow|tmrw?|day after|at|for|from|on|this|next|coming|in|\d+"
+    r"|(?:mon|tue|wed|thu|fri|sat|sun|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*)\b|$"
+)
+
+
+def _failed(response: str) -> bool:
+    return response.startswith("❌")
+
+
+class IntentRouter:
+    """Answers high-confidence schedule, availability and booking requests without the LLM.
+
+    route() returns None for anything it is not sure about so the caller can
+    fall back to the agent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses = 0
+
+    def route(self, message: str, current_date: str) -> Optional[str]:
+        text = " ".join(message.lower().replace("’", "'").strip().rstrip("?.!").split())
+        response = None
+        intent = None
+        if self._is_confident(text, current_date):
+            start_date, end_date = DateParser.parse_date_range(text, current_date)
+
+            try:
+                booking = _BOOKING_RE.match(text)
+                if booking:
+                    intent = "booking"
+                    response = self._book(booking.group("rest"), start_date, end_date)
+                elif _SCHEDULE_RE.match(text):
+                    intent = "schedule"
+                    response = self._schedule(start_date, end_date)
+                elif _AVAILABILITY_RE.match(text):
+                    intent = "availability"
+                    response = self._availability(text, start_date, end_date)
+            except Exception as e:
+                logger.warning(f"Intent router failed on '{intent}', falling back to the agent: {e}")
+                response = None
+            if response is not None and _failed(response):
+                # The agent can explain or work around a tool error better than echoing it
+                logger.info(f"Intent router got an error on '{intent}', falling back to the agent: {response}")
+                response = None
+
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits[intent] = self.hits.get(intent, 0) + 1
+        if response is not None:
+            logger.info(f"Intent router answered '{intent}' without the agent")
+        return response
+
+    def stats(self) -> Dict:
+        with self._lock:
+            routed = sum(self.hits.values())
+            total = routed + self.misses
+            return {
+                "routed": routed,
+                "fallthrough": self.misses,
+                "hit_rate": round(routed / total, 3) if total else 0.0,
+                "by_intent": dict(self.hits),
+            }
+
+    @staticmethod
+    def _is_confident(text: str, current_date: str) -> bool:
+        if len(text) > 120 or _AMBIGUOUS_RE.search(text):
+            return False
+        return len(DateParser.find_date_spans(text, current_date)) == 1
+
+    def _schedule(self, start_date: str, end_date: str) -> Optional[str]:
+        if start_date != end_date:
+            return get_range_availability.func(start_date, end_date)
+
+        date = start_date
+        day_start = day_minutes(datetime.strptime(date, "%Y-%m-%d").date())
+        day_end = day_start + MINUTES_PER_DAY
+        rows = get_calendar_service().busy_index(ist_datetime(day_start), ist_datetime(day_end)).rows(day_start, day_end)
+        if not rows:
+            return f"✅ Nothing is scheduled for {date}. Your day is completely free!"
+
+        lines = [
+            f"• All day: {row.title}" if row.all_day else f"• {ist_clock(row.start)}-{ist_clock(row.end)} {row.title}"
+            for row in rows
+        ]
+        return f"📅 Your schedule for {date} (IST):\n" + "\n".join(lines)
+
+    def _availability(self, text: str, start_date: str, end_date: str) -> Optional[str]:
+        # "Am I free tomorrow at 3pm?" asks about one time, not the whole working day
+        if _TIME_RE.search(text) or DateParser.match_time(text):
+            return None
+        if start_date != end_date:
+            return get_range_availability.func(start_date, end_date)
+        return get_calendar_availability.func(start_date)
+
+    def _book(self, rest: str, start_date: str, end_date: str) -> Optional[str]:
+        if start_date != end_date:
+            return None
+        date = start_date
+
+        remainder = _DURATION_RE.sub("", rest).strip()
+        title = re.sub(r"^an?\s+", "", remainder[:_TITLE_END_RE.search(remainder).start()]).strip() or "meeting"
+        title = title[:1].upper() + title[1:]
+
+        duration_match = _DURATION_RE.search(rest)
+        duration = None
+        if duration_match:
+            amount = int(duration_match.group(1))
+            duration = amount * 60 if duration_match.group(2).startswith("h") else amount
+
+        times = DateParser.match_time(rest)
+        if times:
+            start_time = times["start_time"]
+            end_time = times["end_time"]
+            if duration:
+                end_minute = clock_minutes(start_time) + duration
+                if end_minute >= MINUTES_PER_DAY:
+                    return None
+                end_time = f"{end_minute // 60:02d}:{end_minute % 60:02d}"
+            if clock_minutes(end_time) <= clock_minutes(start_time):
+                return None
+
+            return book_if_free.func(title, date, start_time, end_time)
+        # A time the parser couldn't pin down ("at 3", "25:00") is the agent's to interpret
+        if _TIME_RE.search(rest) or _LOOSE_TIME_RE.search(rest):
+            return None
+
+        period = _PERIOD_RE.search(rest)
+        if not period:
+            return None
+        times = DateParser.extract_time_from_text(period.group(1))
+        day = datetime.strptime(date, "%Y-%m-%d").date()
+        window_start = ist_datetime(ist_minutes(day, times["start_time"]))
+        window_end = ist_datetime(ist_minutes(day, times["end_time"]))
+        slots = find_free_slots(
+            get_calendar_service().get_busy_intervals(window_start, window_end),
+            day, day, duration or 60,
+            work_start=times["start_time"], work_end=times["end_time"], limit=1,
+        )
+        if not slots:
+            # Busy, already over or too short for the meeting; the agent can tell which and offer other times
+            return None
+        slot = slots[0]
+        return book_if_free.func(title, date, slot.start.strftime("%H:%M"), slot.end.strftime("%H:%M"))
@@ -0,0 +1,228 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Minimal Prometheus text-format registry: counters, gauges and histograms with
+# labels. Updates are a dict lookup and a short lock, cheap enough for every call.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self.labels()
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        return self._children[()]
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, values))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value at scrape time instead of tracking it."""
+        self.function = function
+
+    def render(self, name, labelnames, values):
+        value = self.value
+        if self.function is not None:
+            try:
+                value = self.function()
+            except Exception:
+                return []
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(value)}"]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default().set_function(function)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def render(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+chat_requests = registry.register(Counter(
+    "calendent_chat_requests_total", "Chat requests by endpoint and how they were answered", ["endpoint", "outcome"]
+))
+slow_requests = registry.register(Counter(
+    "calendent_slow_requests_total", "Traced chat requests over the slow threshold", ["endpoint"]
+))
+chat_in_flight = registry.register(Gauge("calendent_chat_in_flight", "Chat requests currently being processed"))
+chat_stage_seconds = registry.register(Histogram(
+    "calendent_chat_stage_seconds", "Time spent in each stage of a chat request", ["stage"]
+))
+tool_seconds = registry.register(Histogram("calendent_tool_seconds", "Agent tool latency", ["tool"]))
+tool_errors = registry.register(Counter("calendent_tool_errors_total", "Agent tool calls that reported an error", ["tool"]))
+google_api_calls = registry.register(Counter(
+    "calendent_google_api_calls_total", "Google Calendar API calls by method and outcome", ["method", "outcome"]
+))
+google_api_seconds = registry.register(Histogram(
+    "calendent_google_api_seconds", "Google Calendar API latency per attempt; quota waits and retries are excluded", ["method"]
+))
+llm_calls = registry.register(Counter("calendent_llm_calls_total", "LLM calls made by the agent"))
+llm_tokens = registry.register(Counter("calendent_llm_tokens_total", "LLM tokens used by the agent", ["direction"]))
+agent_tool_calls = registry.register(Counter("calendent_agent_tool_calls_total", "Tool calls made by the agent"))
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from backend.config import settings
+from backend.services.api_scheduler import PREFETCH, call_priority
+from backend.services.calendar_service import get_calendar_service, on_calendar_write
+from backend.services.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Keeps the event store synced in the background so chat reads are served from memory.
+
+    The store already spans yesterday to two months out, which covers the
+    today/tomorrow/this-week questions that make up most traffic; what a
+    request would otherwise pay for is the sync once the store goes stale.
+    Refreshes run every `interval` seconds, and right away after this process
+    writes to the calendar, on the PREFETCH lane so they never delay bookings
+    or interactive calls.
+    """
+
+    def __init__(self, interval: float = settings.PREFETCH_INTERVAL):
+        self.interval = interval
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.refreshes = 0
+        self.triggered = 0
+        self.failures = 0
+        self.last_refresh_ms: Optional[float] = None
+        on_calendar_write(self.request_refresh)
+
+    def request_refresh(self):
+        """Refresh as soon as possible; safe to call from any thread."""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None or loop.is_closed():
+            return
+        self.triggered += 1
+        loop.call_soon_threadsafe(wake.set)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await self.refresh()
+        finally:
+            self._loop = None
+
+    async def refresh(self):
+        started = time.perf_counter()
+        try:
+            calendar_service = await run_blocking(get_calendar_service)
+            if not calendar_service.available or not settings.EVENT_CACHE_ENABLED:
+                return
+            with call_priority(PREFETCH):
+                # Half an interval of slack: a sync a request just did doesn't need repeating
+                await run_blocking(calendar_service.event_store().ensure_fresh, self.interval / 2)
+            self.refreshes += 1
+            self.last_refresh_ms = round((time.perf_counter() - started) * 1000, 1)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Calendar prefetch failed: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": settings.PREFETCH_ENABLED,
+            "interval_seconds": self.interval,
+            "running": self._loop is not None,
+            "refreshes": self.refreshes,
+            "triggered": self.triggered,
+            "failures": self.failures,
+            "last_refresh_ms": self.last_refresh_ms,
+        }
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,86 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+from backend.config import settings
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s:-]")
+_SPACE_RE = re.compile(r"\s+")
+# Messages leaning on earlier turns mean different things in different conversations
+_CONTEXTUAL_RE = re.compile(r"\b(it|that|those|them|same|again|instead|yes|yeah|no|ok|okay|sure|previous|earlier)\b")
+
+
+class CacheKey(NamedTuple):
+    message: str
+    date_range: Tuple[str, str]
+    current_date: str
+    calendar_version: int
+
+
+def normalize_message(message: str) -> str:
+    """Case, punctuation and spacing differences don't change the question."""
+    return _SPACE_RE.sub(" ", _PUNCTUATION_RE.sub(" ", message.lower())).strip()
+
+
+def is_cacheable(message: str) -> bool:
+    return not _CONTEXTUAL_RE.search(normalize_message(message))
+
+
+class ResponseCache:
+    """LRU + TTL cache of agent answers.
+
+    Keys carry the calendar version, so any booking or synced outside change
+    makes every earlier answer unreachable. Changes made through other workers
+    or outside the app count once the event store syncs, which happens at
+    most RESPONSE_CACHE_MAX_STALENESS seconds before each lookup. Without the
+    event cache only this worker's bookings count, and the TTL alone bounds
+    how long an answer can outlive everything else.
+    """
+
+    def __init__(self, max_entries: int = settings.RESPONSE_CACHE_MAX_ENTRIES, ttl: float = settings.RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def key(message: str, date_range: Tuple[str, str], current_date: str, calendar_version: int) -> CacheKey:
+        return CacheKey(normalize_message(message), tuple(date_range), current_date, calendar_version)
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: CacheKey, response: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Counters:
+    def __init__(self):
+        self.requests = 0
+        self.executed = 0
+        self.shared = 0
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "executed": self.executed,
+            "shared": self.shared,
+            "coalescing_ratio": round(self.shared / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+class SingleFlight(_Counters):
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block and receive the same result (or exception). Nothing is
+    cached once the call finishes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight(_Counters):
+    """SingleFlight for coroutines on one event loop; followers await the leader's future."""
+
+    def __init__(self):
+        super().__init__()
+        self._calls: Dict[Hashable, "asyncio.Future"] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        self.requests += 1
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+            # shield: one follower being cancelled must not cancel the shared call
+            return await asyncio.shield(future)
+
+        self.executed += 1
+        future = self._calls[key] = asyncio.ensure_future(func())
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -0,0 +1,140 @@
+import heapq
+import math
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from backend.config import settings
+from backend.services.busy_index import clock_minutes, day_minutes, ist_datetime, to_minutes_ceil
+
+# (start, end) in epoch minutes; see busy_index
+Interval = Tuple[int, int]
+
+
+class Slot(NamedTuple):
+    start: datetime
+    end: datetime
+
+    def label(self) -> str:
+        return f"{self.start.strftime('%a %Y-%m-%d')} {self.start.strftime('%H:%M')}-{self.end.strftime('%H:%M')}"
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort and coalesce overlapping or touching intervals in O(n log n)."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def union_busy(busy_lists: Iterable[List[Interval]]) -> List[Interval]:
+    """Busy time for a group: k-way heap merge of per-person sorted lists, then coalesce.
+
+    Free time common to everyone is then just the gaps in this union.
+    """
+    merged: List[Interval] = []
+    for start, end in heapq.merge(*busy_lists):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_gaps(busy: List[Interval], window_start: int, window_end: int) -> List[Interval]:
+    """Gaps inside [window_start, window_end) not covered by merged busy intervals."""
+    gaps = []
+    cursor = window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+def _round_up(moment: int, granularity: int, anchor: int) -> int:
+    return anchor - (anchor - moment) // granularity * granularity
+
+
+def find_free_slots(
+    busy: Iterable[Interval],
+    start_date: date,
+    end_date: date,
+    duration_minutes: int,
+    work_start: str = settings.WORKING_HOURS_START,
+    work_end: str = settings.WORKING_HOURS_END,
+    buffer_minutes: int = settings.SLOT_BUFFER_MINUTES,
+    granularity_minutes: int = settings.SLOT_GRANULARITY_MINUTES,
+    limit: int = settings.MAX_SUGGESTED_SLOTS,
+    now: Optional[datetime] = None,
+) -> List[Slot]:
+    """Ranked, non-overlapping slots of exactly duration_minutes across the given days.
+
+    Busy intervals are padded by buffer_minutes on both sides before merging.
+    Slots start on granularity boundaries within working hours. Earlier days
+    come first; within a day, slots that sit flush against a busy block or the
+    edge of the working day rank ahead of ones that would fragment a gap.
+    The search runs on epoch minutes; only the chosen slots become datetimes.
+    """
+    duration = duration_minutes
+    granularity = granularity_minutes
+    now_minutes = to_minutes_ceil(now or datetime.now(settings.IST))
+    day_start = clock_minutes(work_start)
+    day_end = clock_minutes(work_end)
+
+    merged = merge_intervals((start - buffer_minutes, end + buffer_minutes) for start, end in busy)
+
+    days = []
+    day = start_date
+    while day <= end_date:
+        days.append(day)
+        day += timedelta(days=1)
+
+    candidates = []
+    for day_index, day in enumerate(days):
+        midnight = day_minutes(day)
+        window_start = midnight + day_start
+        window_end = midnight + day_end
+        if window_end <= now_minutes:
+            continue
+        if window_start < now_minutes:
+            window_start = _round_up(now_minutes, granularity, window_start)
+
+        for gap_start, gap_end in free_gaps(merged, window_start, window_end):
+            slot_start = _round_up(gap_start, granularity, window_start)
+            while slot_start + duration <= gap_end:
+                slot_end = slot_start + duration
+                flush = slot_start == gap_start or slot_end == gap_end
+                candidates.append((day_index, not flush, slot_start, slot_end))
+                slot_start += granularity
+
+    candidates.sort()
+
+    # Spread suggestions across the range before filling any single day
+    per_day = max(1, math.ceil(limit / max(1, len(days))))
+    chosen: List[Tuple[int, int, int]] = []
+    for cap in (per_day, limit):
+        taken = {}
+        for day_index, _, _ in chosen:
+            taken[day_index] = taken.get(day_index, 0) + 1
+        for day_index, _, slot_start, slot_end in candidates:
+            if len(chosen) >= limit:
+                break
+            if taken.get(day_index, 0) >= cap:
+                continue
+            if any(slot_start < other_end and other_start < slot_end for _, other_start, other_end in chosen):
+                continue
+            chosen.append((day_index, slot_start, slot_end))
+            taken[day_index] = taken.get(day_index, 0) + 1
+
+    chosen.sort(key=lambda slot: slot[1])
+    return [Slot(ist_datetime(slot_start), ist_datetime(slot_end)) for _, slot_start, slot_end in chosen]
@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_PROCESS_START = time.monotonic()
+
+
+class StartupReport:
+    """Timings for import, lazy initialization and the first request after boot."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: Dict[str, float] = {}
+        self.first_request: Optional[float] = None
+        self.first_request_after: Optional[float] = None
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self.timings[name] = round(seconds * 1000, 1)
+
+    def record_request(self, seconds: float):
+        if self.first_request is not None:
+            return
+        with self._lock:
+            if self.first_request is None:
+                self.first_request = round(seconds * 1000, 1)
+                self.first_request_after = round((time.monotonic() - _PROCESS_START) * 1000, 1)
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                "uptime_ms": round((time.monotonic() - _PROCESS_START) * 1000, 1),
+                "timings_ms": dict(self.timings),
+                "first_request_ms": self.first_request,
+                "first_request_at_ms": self.first_request_after,
+            }
+
+
+startup_report = StartupReport()
+
+
+class Lazy(Generic[T]):
+    """Thread-safe singleton built on first use; construction time goes into the startup report."""
+
+    def __init__(self, factory: Callable[[], T], name: str):
+        self._factory = factory
+        self._name = name
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        return self._value is not None
+
+    def get(self) -> T:
+        value = self._value
+        if value is not None:
+            return value
+        with self._lock:
+            if self._value is None:
+                started = time.perf_counter()
+                self._value = self._factory()
+                startup_report.record(f"init.{self._name}", time.perf_counter() - started)
+            return self._value
+
+    def override(self, value: T):
+        """Install a prebuilt instance, e.g. a fake in benchmarks."""
+        with self._lock:
+            self._value = value
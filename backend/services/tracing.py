@@ -0,0 +1,194 @@
+import contextvars
+import logging
+import logging.handlers
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from backend.config import settings
+from backend.services.metrics import slow_requests
+
+logger = logging.getLogger(__name__)
+
+# Opt-in span trees for chat requests. Spans follow the request through
+# contextvars, so they nest across awaits and into run_blocking worker threads
+# (which copy the caller's context). Requests slower than the threshold are
+# written to a rotating file with their tree and, optionally, the stacks
+# sampled while they ran.
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "attrs", "start", "end", "children", "thread")
+
+    def __init__(self, name: str, attrs: Optional[Dict] = None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+        self.thread = threading.current_thread().name
+
+    def child(self, name: str, **attrs) -> "Span":
+        span = Span(name, attrs)
+        # list.append is atomic, so worker threads can attach children concurrently
+        self.children.append(span)
+        return span
+
+    def finish(self, **attrs):
+        self.attrs.update(attrs)
+        self.end = time.perf_counter()
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def render(self, origin: float, depth: int = 0) -> List[str]:
+        attrs = " ".join(f"{key}={value!r}" for key, value in self.attrs.items())
+        unfinished = "" if self.end is not None else " (unfinished)"
+        lines = [
+            f"{(self.start - origin) * 1000:9.1f} ms {self.duration * 1000:9.1f} ms  "
+            f"{'  ' * depth}{self.name} [{self.thread}] {attrs}{unfinished}".rstrip()
+        ]
+        for child in sorted(self.children, key=lambda span: span.start):
+            lines.extend(child.render(origin, depth + 1))
+        return lines
+
+
+def _reset(token: contextvars.Token):
+    try:
+        _current.reset(token)
+    except ValueError:
+        # A streamed response closed from another task; that context is gone anyway
+        pass
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def trace_span(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """Child of the current span; a no-op outside a traced request."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, **attrs)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        child.finish()
+        _reset(token)
+
+
+class StackSampler:
+    """Process-wide sampling profiler: the event loop and worker stacks every `interval` seconds.
+
+    Samples are kept for `window` seconds so a slow request can pull the ones
+    taken while it ran. They cover every request in flight at the time, not
+    just the slow one.
+    """
+
+    def __init__(self, interval: float = settings.TRACE_PROFILE_INTERVAL, window: float = settings.TRACE_PROFILE_WINDOW,
+                 max_depth: int = 40):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._samples: deque = deque(maxlen=int(window / interval) * 8)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-sampler", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            now = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self._samples.append((now, names.get(ident, str(ident)), ";".join(reversed(stack))))
+            time.sleep(self.interval)
+
+    def collapsed(self, start: float, end: float) -> Counter:
+        """Folded stacks ("thread;outer;...;inner" -> samples) taken between start and end."""
+        return Counter(
+            f"{thread};{stack}" for at, thread, stack in list(self._samples) if start <= at <= end
+        )
+
+
+_sampler = StackSampler() if settings.TRACE_ENABLED and settings.TRACE_PROFILE else None
+_slow_log: Optional[logging.Logger] = None
+_slow_log_lock = threading.Lock()
+
+
+def _slow_request_log() -> logging.Logger:
+    global _slow_log
+    with _slow_log_lock:
+        if _slow_log is None:
+            handler = logging.handlers.RotatingFileHandler(
+                settings.TRACE_FILE, maxBytes=settings.TRACE_FILE_MAX_BYTES,
+                backupCount=settings.TRACE_FILE_BACKUPS, encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            slow_log = logging.getLogger("calendent.slow_requests")
+            slow_log.addHandler(handler)
+            slow_log.setLevel(logging.INFO)
+            slow_log.propagate = False
+            _slow_log = slow_log
+    return _slow_log
+
+
+def _dump(root: Span):
+    lines = [
+        f"=== {datetime.now(settings.IST).isoformat()} slow {root.name} {root.duration:.2f}s "
+        f"(threshold {settings.TRACE_SLOW_THRESHOLD:g}s)",
+        "    start   duration  span",
+    ]
+    lines.extend(root.render(root.start))
+    if _sampler is not None:
+        stacks = _sampler.collapsed(root.start, root.end or time.perf_counter())
+        lines.append(f"--- {sum(stacks.values())} stack samples taken while it ran (all threads, folded)")
+        lines.extend(f"{count} {stack}" for stack, count in stacks.most_common(settings.TRACE_PROFILE_MAX_STACKS))
+    _slow_request_log().info("\n".join(lines) + "\n")
+
+
+@contextmanager
+def trace_request(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """Root span for one request when tracing is on; dumps the tree if it ran slow."""
+    if not settings.TRACE_ENABLED:
+        yield None
+        return
+    if _sampler is not None:
+        _sampler.start()
+    root = Span(name, attrs)
+    token = _current.set(root)
+    try:
+        yield root
+    finally:
+        _reset(token)
+        root.finish()
+        if root.duration >= settings.TRACE_SLOW_THRESHOLD:
+            slow_requests.labels(endpoint=name).inc()
+            try:
+                _dump(root)
+            except Exception as e:
+                logger.warning(f"Couldn't write slow request trace: {e}")
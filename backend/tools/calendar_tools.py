@@ -1,88 +1,263 @@
-from langchain.tools import tool
-from backend.services.calendar_service import CalendarService
+import functools
+from langchain.tools import StructuredTool
+from backend.agents.call_accounting import reports_error
+from backend.services.calendar_service import event_body, get_calendar_service
+from backend.services.concurrency import run_blocking
+from backend.services.busy_index import clock_minutes, event_minutes, ist_clock, ist_datetime, ist_minutes
+from backend.services.metrics import tool_errors, tool_seconds
+from backend.services.single_flight import AsyncSingleFlight
+from backend.services.tracing import trace_span
+from backend.services.slot_finder import find_free_slots, free_gaps, merge_intervals, union_busy
 from backend.config import settings
-from datetime import datetime
+from datetime import date, datetime
+from typing import Tuple
 
-calendar_service = CalendarService()
+MAX_RANGE_DAYS = 31
 
-@tool
+
+_read_flight = AsyncSingleFlight()
+
+
+def _instrumented(func):
+    """Record latency per tool, and count calls whose answer reports an error."""
+    timer = tool_seconds.labels(tool=func.__name__)
+    errors = tool_errors.labels(tool=func.__name__)
+    span_name = f"tool:{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with trace_span(span_name, **kwargs), timer.time():
+            result = func(*args, **kwargs)
+        if reports_error(result):
+            errors.inc()
+        return result
+
+    return wrapper
+
+
+def calendar_tool(func):
+    """Like @tool, but the async path runs the blocking body on the calendar worker pool."""
+    func = _instrumented(func)
+
+    async def coroutine(**kwargs):
+        return await run_blocking(func, **kwargs)
+
+    return StructuredTool.from_function(func=func, coroutine=coroutine)
+
+
+def calendar_read_tool(func):
+    """calendar_tool for pure reads: identical concurrent calls share one worker-pool run."""
+    func = _instrumented(func)
+
+    async def coroutine(**kwargs):
+        key = (func.__name__, tuple(sorted(kwargs.items())))
+        return await _read_flight.do(key, lambda: run_blocking(func, **kwargs))
+
+    return StructuredTool.from_function(func=func, coroutine=coroutine)
+
+
+def read_tool_stats() -> dict:
+    return _read_flight.stats()
+
+
+def _ist_window(first_day: date, last_day: date, start_time: str, end_time: str) -> Tuple[datetime, datetime]:
+    """start_time on first_day to end_time on last_day, IST."""
+    return ist_datetime(ist_minutes(first_day, start_time)), ist_datetime(ist_minutes(last_day, end_time))
+
+
+@calendar_read_tool
 def get_calendar_availability(date: str, start_time: str = "09:00", end_time: str = "17:00") -> str:
     """Check calendar availability for a specific date and time range in IST timezone."""
     try:
-        availability = calendar_service.check_availability(date, start_time, end_time)
+        availability = get_calendar_service().check_availability(date, start_time, end_time)
         
         if availability['is_free']:
             return f"✅ {date} is completely free from {start_time} to {end_time} IST. Available for booking!"
         
-        busy_slots = []
-        for event in availability['events']:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-            title = event.get('summary', 'Busy')
-
-            if 'T' in start:
-                start_utc = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                end_utc = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                start_ist = start_utc.astimezone(settings.IST)
-                end_ist = end_utc.astimezone(settings.IST)
-
-                start_time_str = start_ist.strftime('%H:%M')
-                end_time_str = end_ist.strftime('%H:%M')
-                busy_slots.append(f"{start_time_str}-{end_time_str} ({title})")
+        busy_slots = [
+            f"{ist_clock(start)}-{ist_clock(end)} ({title})"
+            for start, end, title, all_day in availability['busy']
+            if not all_day
+        ]
 
         return f"📅 {date} has these busy times (IST): {', '.join(busy_slots)}. I can suggest free slots around these times."
 
     except Exception as e:
         return f"❌ Error checking calendar: {str(e)}"
 
-@tool
-def create_calendar_event(title: str, date: str, start_time: str, end_time: str, description: str = "") -> str:
-    """Create a calendar event in IST timezone and return confirmation."""
+@calendar_read_tool
+def get_range_availability(start_date: str, end_date: str, start_time: str = "09:00", end_time: str = "17:00") -> str:
+    """Check availability for every day in a date range (e.g. a whole week) in one call, in IST timezone.
+    Returns a compact busy/free summary per day. Dates are YYYY-MM-DD and the range is inclusive."""
     try:
-        date_obj = datetime.strptime(date, "%Y-%m-%d")
-        start_datetime = datetime.combine(date_obj.date(), datetime.strptime(start_time, "%H:%M").time())
-        end_datetime = datetime.combine(date_obj.date(), datetime.strptime(end_time, "%H:%M").time())
-
-        start_datetime = settings.IST.localize(start_datetime)
-        end_datetime = settings.IST.localize(end_datetime)
-
-        event = {
-            'summary': title,
-            'description': description,
-            'start': {
-                'dateTime': start_datetime.isoformat(),
-                'timeZone': 'Asia/Kolkata',
-            },
-            'end': {
-                'dateTime': end_datetime.isoformat(),
-                'timeZone': 'Asia/Kolkata',
-            },
-        }
-
-        created_event = calendar_service.create_event(event)
-        return f"🎉 SUCCESS! Booked '{title}' on {date} from {start_time} to {end_time} IST. Event ID: {created_event.get('id')}"
+        first_day = datetime.strptime(start_date, "%Y-%m-%d")
+        last_day = datetime.strptime(end_date, "%Y-%m-%d")
+        if (last_day - first_day).days >= MAX_RANGE_DAYS:
+            return f"❌ Please ask for at most {MAX_RANGE_DAYS} days at a time."
+
+        days = get_calendar_service().check_availability_range(start_date, end_date, start_time, end_time)
+
+        lines = []
+        for day, availability in days.items():
+            label = datetime.strptime(day, "%Y-%m-%d").strftime("%a %Y-%m-%d")
+            if availability['is_free']:
+                lines.append(f"• {label}: free {start_time}-{end_time}")
+                continue
+
+            window_start, window_end = availability['window']
+            busy = [
+                f"all day ({title})" if all_day else f"{ist_clock(start)}-{ist_clock(end)} ({title})"
+                for start, end, title, all_day in availability['busy']
+            ]
+            intervals = [(start, end) for start, end, _, _ in availability['busy']]
+            free = [
+                f"{ist_clock(gap_start)}-{ist_clock(gap_end)}"
+                for gap_start, gap_end in free_gaps(merge_intervals(intervals), window_start, window_end)
+            ]
+            lines.append(f"• {label}: busy {', '.join(busy)}; free {', '.join(free) or 'none'}")
+
+        return f"📅 Availability {start_date} to {end_date} (IST):\n" + "\n".join(lines)
+
+    except Exception as e:
+        return f"❌ Error checking calendar: {str(e)}"
+
+
+@calendar_tool
+def book_if_free(title: str, date: str, start_time: str, end_time: str, description: str = "", idempotency_key: str = "") -> str:
+    """Book an event in IST timezone only if the time is free, checking and booking in one atomic step.
+    No separate availability check is needed. On a clash it lists the conflicts and free alternatives.
+    Pass the same idempotency_key when retrying so the event is never booked twice."""
+    try:
+        if clock_minutes(end_time) <= clock_minutes(start_time):
+            return f"❌ End time {end_time} must be after start time {start_time}."
+
+        event = event_body(title, date, start_time, end_time, description)
+        calendar_service = get_calendar_service()
+        result = calendar_service.book_if_free(event, idempotency_key or None)
+
+        if result['status'] == 'booked':
+            return f"🎉 SUCCESS! Booked '{title}' on {date} from {start_time} to {end_time} IST. Event ID: {result['event'].get('id')}"
+        if result['status'] == 'duplicate':
+            return f"🎉 SUCCESS! '{title}' on {date} from {start_time} to {end_time} IST was already booked. Event ID: {result['event'].get('id')}"
+
+        clashes = []
+        for conflict in result['conflicts']:
+            conflict_start, conflict_end = event_minutes(conflict)
+            clashes.append(f"{ist_clock(conflict_start)}-{ist_clock(conflict_end)} ({conflict.get('summary', 'Busy')})")
+
+        day = datetime.strptime(date, "%Y-%m-%d").date()
+        duration = clock_minutes(end_time) - clock_minutes(start_time)
+        range_start, range_end = _ist_window(day, day, settings.WORKING_HOURS_START, settings.WORKING_HOURS_END)
+        slots = find_free_slots(calendar_service.get_busy_intervals(range_start, range_end), day, day, duration)
+        alternatives = ", ".join(f"{slot.start.strftime('%H:%M')}-{slot.end.strftime('%H:%M')}" for slot in slots) or "none"
+
+        return (
+            f"⚠️ Not booked: {date} {start_time}-{end_time} IST clashes with {', '.join(clashes)}. "
+            f"Free {duration}-minute slots that day: {alternatives}."
+        )
 
     except Exception as e:
         return f"❌ Failed to create event: {str(e)}"
 
-@tool
-def suggest_time_slots(date: str, duration_minutes: int = 60) -> str:
-    """Suggest available time slots for a given date based on calendar availability."""
+@calendar_tool
+def create_calendar_events_bulk(title: str, dates: str, start_time: str, end_time: str, description: str = "") -> str:
+    """Book the same event on many dates at once in IST timezone, e.g. daily standups for a week.
+    dates is a comma-separated list of YYYY-MM-DD dates. Each date is checked for conflicts and booked in one step;
+    dates that clash are skipped and reported."""
     try:
-        availability_result = get_calendar_availability(date)
-
-        if "completely free" in availability_result:
-            suggestions = [
-                "09:00-10:00 (Morning slot)",
-                "10:00-11:00 (Late morning)",
-                "11:00-12:00 (Pre-lunch)",
-                "14:00-15:00 (Early afternoon)",
-                "15:00-16:00 (Mid afternoon)",
-                "16:00-17:00 (Late afternoon)"
-            ]
-            return f"💡 Here are suggested time slots for {date}:\n• " + "\n• ".join(suggestions)
-        else:
-            return f"💡 Based on your calendar, here are some free slots for {date}:\n• Before 12:00\n• 13:00 onwards\n\nWould you like me to book a specific time?"
+        days = [day.strip() for day in dates.split(",") if day.strip()]
+        if len(days) > settings.BULK_MAX_EVENTS:
+            return f"❌ Please book at most {settings.BULK_MAX_EVENTS} events at a time."
+
+        valid_days = []
+        events = []
+        problems = []
+        for day in days:
+            try:
+                events.append(event_body(title, day, start_time, end_time, description))
+                valid_days.append(day)
+            except ValueError:
+                problems.append(f"{day} (not a valid date)")
+        results = get_calendar_service().create_events_bulk(events)
+
+        booked = [valid_days[result['index']] for result in results if result['status'] == 'booked']
+        for result in results:
+            if result['status'] == 'conflict':
+                problems.append(f"{valid_days[result['index']]} (clashes with {', '.join(result['conflicts'])})")
+            elif result['status'] != 'booked':
+                problems.append(f"{valid_days[result['index']]} ({result.get('error', result['status'])})")
+
+        summary = f"🎉 SUCCESS! Booked '{title}' {start_time}-{end_time} IST on {len(booked)} of {len(days)} dates: {', '.join(booked)}." if booked else "❌ None of the dates could be booked."
+        if problems:
+            summary += f"\n⚠️ Not booked: {'; '.join(problems)}"
+        return summary
+
+    except Exception as e:
+        return f"❌ Failed to create events: {str(e)}"
+
+@calendar_read_tool
+def suggest_time_slots(date: str, duration_minutes: int = 60, end_date: str = "", start_time: str = "", end_time: str = "", buffer_minutes: int = 0) -> str:
+    """Suggest concrete free time slots of exactly duration_minutes in IST timezone.
+
+    Pass end_date (YYYY-MM-DD) to search a range of days, e.g. a whole week.
+    start_time/end_time (HH:MM) narrow the search window; buffer_minutes keeps a gap around existing events."""
+    try:
+        first_day = datetime.strptime(date, "%Y-%m-%d").date()
+        last_day = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else first_day
+        if last_day < first_day:
+            return f"❌ end_date {end_date} is before {date}."
+
+        work_start = start_time or settings.WORKING_HOURS_START
+        work_end = end_time or settings.WORKING_HOURS_END
+        range_start, range_end = _ist_window(first_day, last_day, work_start, work_end)
+
+        busy = get_calendar_service().get_busy_intervals(range_start, range_end)
+        slots = find_free_slots(
+            busy, first_day, last_day, duration_minutes,
+            work_start=work_start, work_end=work_end, buffer_minutes=buffer_minutes,
+        )
+
+        period = date if last_day == first_day else f"{date} to {end_date}"
+        if not slots:
+            return f"😕 No free {duration_minutes}-minute slots between {work_start} and {work_end} IST for {period}."
+
+        return f"💡 Free {duration_minutes}-minute slots for {period} (IST):\n• " + "\n• ".join(slot.label() for slot in slots)
 
     except Exception as e:
         return f"❌ Error getting suggestions: {str(e)}"
+
+@calendar_read_tool
+def find_group_slots(calendar_ids: str, date: str, duration_minutes: int = 60, end_date: str = "", start_time: str = "", end_time: str = "") -> str:
+    """Find time slots when several people are all free, in IST timezone, with one free/busy lookup.
+    calendar_ids is a comma-separated list of attendee calendar emails; the user's own calendar is always included.
+    Pass end_date (YYYY-MM-DD) to search a range of days."""
+    try:
+        attendees = [calendar_id.strip() for calendar_id in calendar_ids.split(",") if calendar_id.strip()]
+        everyone = list(dict.fromkeys([settings.CALENDAR_ID] + attendees))
+
+        first_day = datetime.strptime(date, "%Y-%m-%d").date()
+        last_day = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else first_day
+        work_start = start_time or settings.WORKING_HOURS_START
+        work_end = end_time or settings.WORKING_HOURS_END
+        range_start, range_end = _ist_window(first_day, last_day, work_start, work_end)
+
+        busy, errors = get_calendar_service().query_free_busy(everyone, range_start, range_end)
+        slots = find_free_slots(
+            union_busy(sorted(intervals) for intervals in busy.values()),
+            first_day, last_day, duration_minutes,
+            work_start=work_start, work_end=work_end,
+        )
+
+        period = date if last_day == first_day else f"{date} to {end_date}"
+        unreadable = f"\n⚠️ Couldn't read: {', '.join(f'{cid} ({reason})' for cid, reason in errors.items())}" if errors else ""
+        if not slots:
+            return f"😕 No common {duration_minutes}-minute slot for {len(busy)} calendars on {period}.{unreadable}"
+
+        return (
+            f"💡 Common free {duration_minutes}-minute slots for {', '.join(busy)} on {period} (IST):\n• "
+            + "\n• ".join(slot.label() for slot in slots)
+            + unreadable
+        )
+
+    except Exception as e:
+        return f"❌ Error finding group slots: {str(e)}"
@@ -0,0 +1,182 @@
+import json
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+from backend.config import settings
+from backend.services.calendar_service import event_body, get_calendar_service
+from backend.services.date_parser import DateParser
+from backend.services.busy_index import (
+    MINUTES_PER_DAY, clock_minutes, event_minutes, ist_clock, ist_datetime, ist_minutes,
+)
+from backend.services.slot_finder import find_free_slots, free_gaps, merge_intervals
+from backend.tools.calendar_tools import MAX_RANGE_DAYS, calendar_read_tool, calendar_tool
+
+# These tools answer in compact JSON so the model can act on the result without re-reading prose
+
+
+def _json(payload: Dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _resolve_when(when: str) -> Tuple[date, date]:
+    current_date = datetime.now(settings.IST).strftime("%Y-%m-%d")
+    date_range = DateParser.parse_date_range(when, current_date)
+    if not date_range:
+        raise ValueError(f"Couldn't understand the date '{when}'. Use YYYY-MM-DD or a phrase like 'next friday'.")
+    return (
+        datetime.strptime(date_range[0], "%Y-%m-%d").date(),
+        datetime.strptime(date_range[1], "%Y-%m-%d").date(),
+    )
+
+
+def _day_rows(first_day: date, last_day: date, start_time: str, end_time: str) -> List[Dict]:
+    """Busy and free blocks per day from one ranged read."""
+    days = get_calendar_service().check_availability_range(
+        first_day.isoformat(), last_day.isoformat(), start_time, end_time
+    )
+    rows = []
+    for day, availability in days.items():
+        window_start, window_end = availability["window"]
+        intervals = [
+            (max(start, window_start), min(end, window_end)) for start, end, _, _ in availability["busy"]
+        ]
+        free = free_gaps(merge_intervals(intervals), window_start, window_end)
+        rows.append({
+            "date": day,
+            "weekday": datetime.strptime(day, "%Y-%m-%d").strftime("%a"),
+            "busy": [
+                [ist_clock(start), ist_clock(end), row.title]
+                for (start, end), row in zip(intervals, availability["busy"])
+            ],
+            "free": [[ist_clock(start), ist_clock(end)] for start, end in free],
+            "free_minutes": sum(end - start for start, end in free),
+        })
+    return rows
+
+
+@calendar_read_tool
+def resolve_and_check(when: str, start_time: str = "", end_time: str = "") -> str:
+    """Resolve a date phrase ("tomorrow", "next friday", "next week", "2025-07-04") and return busy and free
+    blocks (IST, HH:MM) for every day in it, in one call. start_time/end_time narrow the window; default is working hours.
+    Returns JSON."""
+    try:
+        first_day, last_day = _resolve_when(when)
+        if (last_day - first_day).days >= MAX_RANGE_DAYS:
+            return _json({"status": "error", "error": f"At most {MAX_RANGE_DAYS} days at a time"})
+        window_start = start_time or settings.WORKING_HOURS_START
+        window_end = end_time or settings.WORKING_HOURS_END
+        return _json({
+            "status": "ok",
+            "start_date": first_day.isoformat(),
+            "end_date": last_day.isoformat(),
+            "window": [window_start, window_end],
+            "days": _day_rows(first_day, last_day, window_start, window_end),
+        })
+    except Exception as e:
+        return _json({"status": "error", "error": str(e)})
+
+
+@calendar_tool
+def find_and_book(
+    title: str,
+    when: str,
+    duration_minutes: int = 60,
+    start_time: str = "",
+    earliest: str = "",
+    latest: str = "",
+    description: str = "",
+    idempotency_key: str = "",
+) -> str:
+    """Resolve the date, check the calendar and book, all in ONE call (IST).
+    when is a date phrase ("tomorrow", "next friday") or YYYY-MM-DD.
+    With start_time (HH:MM) it books exactly then if free, otherwise reports the clash and alternatives.
+    Without start_time it books the first free duration_minutes slot between earliest and latest (default working hours).
+    Returns JSON; on success its "message" field is the confirmation to show the user."""
+    try:
+        first_day, last_day = _resolve_when(when)
+        window_start = earliest or settings.WORKING_HOURS_START
+        window_end = latest or settings.WORKING_HOURS_END
+        calendar_service = get_calendar_service()
+
+        def alternatives(first: date, last: date, limit: int) -> List[List[str]]:
+            range_start = ist_datetime(ist_minutes(first, window_start))
+            range_end = ist_datetime(ist_minutes(last, window_end))
+            slots = find_free_slots(
+                calendar_service.get_busy_intervals(range_start, range_end), first, last, duration_minutes,
+                work_start=window_start, work_end=window_end, limit=limit,
+            )
+            return [[slot.start.date().isoformat(), slot.start.strftime("%H:%M"), slot.end.strftime("%H:%M")] for slot in slots]
+
+        if start_time:
+            end_minute = clock_minutes(start_time) + duration_minutes
+            if end_minute >= MINUTES_PER_DAY:
+                return _json({"status": "error", "error": "The meeting would run past midnight"})
+            end_time = f"{end_minute // 60:02d}:{end_minute % 60:02d}"
+            candidates = [[first_day.isoformat(), start_time, end_time]]
+        else:
+            # A few candidates in case a concurrent booking takes the first one
+            candidates = alternatives(first_day, last_day, 3)
+            if not candidates:
+                return _json({"status": "no_slot", "error": f"No free {duration_minutes}-minute slot between {window_start} and {window_end} for {when}"})
+
+        for day, slot_start, slot_end in candidates:
+            result = calendar_service.book_if_free(
+                event_body(title, day, slot_start, slot_end, description), idempotency_key or None
+            )
+            if result["status"] in ("booked", "duplicate"):
+                return _json({
+                    "status": result["status"],
+                    "message": f"🎉 SUCCESS! Booked '{title}' on {day} from {slot_start} to {slot_end} IST.",
+                    "event_id": result["event"].get("id"),
+                    "date": day,
+                    "start_time": slot_start,
+                    "end_time": slot_end,
+                })
+            if start_time:
+                clashes = []
+                for event in result["conflicts"]:
+                    start, end = event_minutes(event)
+                    clashes.append([ist_clock(start), ist_clock(end), event.get("summary", "Busy")])
+                return _json({
+                    "status": "conflict",
+                    "date": day,
+                    "clashes": clashes,
+                    "alternatives": alternatives(first_day, first_day, settings.MAX_SUGGESTED_SLOTS),
+                })
+
+        return _json({"status": "no_slot", "error": "Every free slot was taken while booking; ask again"})
+    except Exception as e:
+        return _json({"status": "error", "error": str(e)})
+
+
+@calendar_read_tool
+def week_summary(week_of: str = "", start_time: str = "", end_time: str = "") -> str:
+    """Summarize a whole week (Mon-Sun) in one call: meetings, free minutes and free blocks per day,
+    plus the busiest and freest days. week_of is any date phrase inside the week; default is this week. Returns JSON."""
+    try:
+        anchor, _ = _resolve_when(week_of) if week_of else (datetime.now(settings.IST).date(), None)
+        monday = anchor - timedelta(days=anchor.weekday())
+        window_start = start_time or settings.WORKING_HOURS_START
+        window_end = end_time or settings.WORKING_HOURS_END
+        rows = _day_rows(monday, monday + timedelta(days=6), window_start, window_end)
+
+        summary = [
+            {
+                "date": row["date"],
+                "weekday": row["weekday"],
+                "meetings": len(row["busy"]),
+                "free_minutes": row["free_minutes"],
+                "free": row["free"],
+            }
+            for row in rows
+        ]
+        return _json({
+            "status": "ok",
+            "week": [rows[0]["date"], rows[-1]["date"]],
+            "window": [window_start, window_end],
+            "meetings": sum(day["meetings"] for day in summary),
+            "busiest_day": min(summary, key=lambda day: day["free_minutes"])["date"],
+            "freest_day": max(summary, key=lambda day: day["free_minutes"])["date"],
+            "days": summary,
+        })
+    except Exception as e:
+        return _json({"status": "error", "error": str(e)})
@@ -0,0 +1,85 @@
+"""Micro-benchmark for BusyIndex against handling event dicts one datetime at a time.
+
+Every day view, conflict check and slot search used to parse each event's
+ISO timestamps into aware datetimes, convert them to IST and strftime them.
+This times that per-event path against building the columnar index once and
+answering per-day queries from integer minutes.
+
+Run from the repository root:
+    python -m benchmarks.bench_busy_index
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from backend.config import settings
+from backend.services.busy_index import BusyIndex, day_minutes, ist_clock
+from benchmarks.fake_calendar import FakeCalendarAPI
+
+
+def _events(density: int, days: int) -> List[Dict]:
+    api = FakeCalendarAPI(latency=0, density=density, lookback_days=0, horizon_days=days)
+    return api.list_events("bench@example.com", None, None, None, None, 10 ** 6)["items"]
+
+
+def _event_bounds(event: Dict) -> Tuple[datetime, datetime]:
+    """The old per-event parse: (start, end) as aware datetimes; all-day events span IST midnights."""
+    bounds = []
+    for key in ("start", "end"):
+        value = event[key]
+        if "dateTime" in value:
+            bounds.append(datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")))
+        else:
+            day = datetime.strptime(value["date"], "%Y-%m-%d")
+            bounds.append(settings.IST.localize(day))
+    return bounds[0], bounds[1]
+
+
+def _datetime_day(events: List[Dict]) -> List[str]:
+    """The old day view: parse the day's events to datetimes, convert to IST and strftime them."""
+    lines = []
+    for event in events:
+        start, end = _event_bounds(event)
+        start, end = start.astimezone(settings.IST), end.astimezone(settings.IST)
+        lines.append(f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')} {event.get('summary', 'Busy')}")
+    return lines
+
+
+def _index_day(index: BusyIndex, day_start: int) -> List[str]:
+    return [f"{ist_clock(row.start)}-{ist_clock(row.end)} {row.title}" for row in index.rows(day_start, day_start + 1440)]
+
+
+def _seconds(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(density: int = 8, days: int = 120, repeat: int = 5):
+    events = _events(density, days)
+    first = datetime.now(settings.IST).date()
+    dates = [first + timedelta(days=offset) for offset in range(days)]
+    index = BusyIndex(events)
+    # Each day's events already fetched, as the event store hands them out
+    per_day = [index.events_at(index.indices(day_minutes(day), day_minutes(day) + 1440)) for day in dates]
+    assert [_datetime_day(day_events) for day_events in per_day] == [_index_day(index, day_minutes(day)) for day in dates]
+
+    parse_old = _seconds(lambda: [_event_bounds(event) for event in events], repeat)
+    build = _seconds(lambda: BusyIndex(events), repeat)
+    days_old = _seconds(lambda: [_datetime_day(day_events) for day_events in per_day], repeat)
+    days_new = _seconds(lambda: [_index_day(index, day_minutes(day)) for day in dates], repeat)
+    busy = _seconds(lambda: [index.busy(day_minutes(day), day_minutes(day) + 1440) for day in dates], repeat)
+
+    count = len(events)
+    print(f"events: {count} ({density}/weekday over {days} days), best of {repeat}")
+    print(f"parse to datetimes:           {parse_old / count * 1e6:8.2f} us/event")
+    print(f"build BusyIndex (parse once): {build / count * 1e6:8.2f} us/event")
+    print(f"day view via datetimes:       {days_old / count * 1e6:8.2f} us/event, every time")
+    print(f"day view via BusyIndex:       {days_new / count * 1e6:8.2f} us/event ({days_old / days_new:.1f}x)")
+    print(f"busy intervals via BusyIndex: {busy / count * 1e6:8.2f} us/event")
+
+
+if __name__ == "__main__":
+    main()
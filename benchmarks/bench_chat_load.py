@@ -0,0 +1,251 @@
+"""Offline load test for the chat API.
+
+Drives the FastAPI app in-process over ASGI with a weighted mix
+of Streamlit quick actions and booking flows. Gemini is replaced by a scripted
+tool-calling model and Google Calendar by an in-memory fake, each with a
+configurable latency, so nothing leaves the machine and no quota is spent.
+
+Run from the repository root:
+    python -m benchmarks.bench_chat_load
+    python -m benchmarks.bench_chat_load --requests 500 --concurrency 32 --llm-latency 0.8 --api-latency 0.1
+    python -m benchmarks.bench_chat_load --mix agent --stream
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+QUICK_ACTIONS = [
+    "What's my schedule for today?",
+    "What's my availability tomorrow?",
+    "Book a 30-minute meeting tomorrow afternoon",
+    "Show me this week's availability",
+]
+# (weight, message); {hour} and {day} are filled per request so bookings spread out
+MIXES: Dict[str, List[Tuple[int, str]]] = {
+    "quick": [(1, message) for message in QUICK_ACTIONS],
+    "agent": [
+        (3, "How does my week look?"),
+        (3, "Am I free {day} or should we push it?"),
+        (2, "Suggest some slots for a 1 hour workshop {day}"),
+        (2, "Book a design review with the team {day} at {hour} pm"),
+        (1, "Schedule a sync with Priya {day} afternoon"),
+        (1, "Hi, what can you do?"),
+    ],
+    "mixed": [
+        (4, QUICK_ACTIONS[0]),
+        (4, QUICK_ACTIONS[1]),
+        (2, QUICK_ACTIONS[2]),
+        (3, QUICK_ACTIONS[3]),
+        (2, "How does my week look?"),
+        (2, "Am I free {day} or should we push it?"),
+        (1, "Suggest some slots for a 1 hour workshop {day}"),
+        (2, "Book a design review with the team {day} at {hour} pm"),
+        (1, "Book a 1:1 {day} at {hour} pm"),
+    ],
+}
+DAYS = ["tomorrow", "next monday", "next tuesday", "next wednesday", "next thursday", "next friday"]
+_SAMPLE_RE = re.compile(r"^([a-z_]+)(\{[^}]*\})? ([0-9.e+-]+|\+Inf)$")
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(percent / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def _metric_totals(text: str) -> Dict[str, float]:
+    """Sum every counter in a /metrics scrape over its labels, plus per-outcome chat counts."""
+    totals: Counter = Counter()
+    for line in text.splitlines():
+        match = _SAMPLE_RE.match(line)
+        if not match or not match.group(1).endswith("_total"):
+            continue
+        name, labels, value = match.groups()
+        totals[name] += float(value)
+        if name == "calendent_chat_requests_total":
+            outcome = re.search(r'outcome="([^"]+)"', labels or "")
+            totals[f"outcome:{outcome.group(1) if outcome else '?'}"] += float(value)
+    return totals
+
+
+def _message(rng: random.Random, mix: List[Tuple[int, str]]) -> str:
+    template = rng.choices([message for _, message in mix], weights=[weight for weight, _ in mix])[0]
+    return template.format(day=rng.choice(DAYS), hour=rng.randint(1, 5))
+
+
+async def _stream(app, payload: Dict) -> Tuple[bool, float]:
+    """POST to /api/chat/stream straight through ASGI; httpx's ASGI transport buffers whole bodies."""
+    body = json.dumps(payload).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/api/chat/stream", "raw_path": b"/api/chat/stream", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    started = time.perf_counter()
+    state = {"status": None, "first_byte": None, "text": ""}
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            state["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            if message.get("body") and state["first_byte"] is None:
+                state["first_byte"] = time.perf_counter() - started
+            state["text"] += message.get("body", b"").decode()
+            if not message.get("more_body"):
+                finished.set()
+
+    await app(scope, receive, send)
+    events = re.findall(r"^event: (\w+)$", state["text"], re.MULTILINE)
+    return state["status"] == 200 and events[-1:] == ["done"], state["first_byte"]
+
+
+async def _send(client, app, message: str, user_id: str, stream: bool) -> Tuple[bool, float, Optional[float]]:
+    """(ok, seconds to the full answer, seconds to the first byte when streaming)."""
+    payload = {"message": message, "user_id": user_id}
+    started = time.perf_counter()
+    if stream:
+        ok, first_byte = await _stream(app, payload)
+        return ok, time.perf_counter() - started, first_byte
+    response = await client.post("/api/chat", json=payload)
+    return response.status_code == 200, time.perf_counter() - started, None
+
+
+async def run(args) -> Dict:
+    # Deferred: settings are read at import time, after the environment is set up in main()
+    import httpx
+    from backend.agents.chat_agent import ChatAgent
+    from backend.api import chat
+    from backend.main import app
+    from backend.services.api_scheduler import ApiScheduler
+    from backend.services.calendar_service import CalendarService, _calendar_service
+    from backend.services.prefetcher import prefetcher
+    from benchmarks.fake_calendar import FakeCalendarAPI, FakeServicePool
+    from benchmarks.fake_llm import ScriptedChatModel
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    api = FakeCalendarAPI(latency=args.api_latency, density=args.density, seed=args.seed)
+    _calendar_service.override(CalendarService(
+        pool=FakeServicePool(api), scheduler=ApiScheduler(rate=args.qps, burst=max(1, int(args.qps * 2)))
+    ))
+    chat.chat_agent.override(ChatAgent(llm=ScriptedChatModel(latency=args.llm_latency)))
+
+    rng = random.Random(args.seed)
+    mix = MIXES[args.mix]
+    messages = [_message(rng, mix) for _ in range(args.warmup + args.requests)]
+    warmup, measured = messages[:args.warmup], messages[args.warmup:]
+
+    # The app's lifespan would also start the keep-alive ping, so run just the prefetcher
+    prefetch = asyncio.create_task(prefetcher.run()) if args.prefetch else None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for message in warmup:
+            await _send(client, app, message, "bench-warmup", args.stream)
+        before = _metric_totals((await client.get("/metrics")).text)
+        api_before = Counter(api.calls)
+
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        for message in measured:
+            queue.put_nowait(message)
+        results: List[Tuple[bool, float, Optional[float]]] = []
+
+        async def user(index: int):
+            while not queue.empty():
+                results.append(await _send(client, app, queue.get_nowait(), f"bench-{index}", args.stream))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(index) for index in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        after = _metric_totals((await client.get("/metrics")).text)
+    if prefetch:
+        prefetch.cancel()
+
+    return {
+        "results": results,
+        "elapsed": elapsed,
+        "metrics": {name: after[name] - before.get(name, 0) for name in after},
+        "api_calls": Counter(api.calls) - api_before,
+    }
+
+
+def report(args, outcome: Dict):
+    results = outcome["results"]
+    latencies = [seconds for ok, seconds, _ in results if ok]
+    errors = sum(1 for ok, _, _ in results if not ok)
+    count = len(results)
+    metrics = outcome["metrics"]
+
+    print(f"mix={args.mix} requests={count} concurrency={args.concurrency} stream={args.stream}")
+    print(f"llm latency {args.llm_latency * 1000:.0f} ms, calendar latency {args.api_latency * 1000:.0f} ms, "
+          f"{args.density} events/day, {args.qps:g} calendar qps, prefetch {'on' if args.prefetch else 'off'}")
+    print(f"throughput:   {count / outcome['elapsed']:8.1f} req/s over {outcome['elapsed']:.2f}s, {errors} errors")
+    if latencies:
+        print(f"latency (ms): p50 {_percentile(latencies, 50) * 1000:8.1f}   p95 {_percentile(latencies, 95) * 1000:8.1f}   "
+              f"p99 {_percentile(latencies, 99) * 1000:8.1f}   max {max(latencies) * 1000:8.1f}")
+    first_bytes = [first_byte for ok, _, first_byte in results if ok and first_byte is not None]
+    if first_bytes:
+        print(f"ttfb (ms):    p50 {_percentile(first_bytes, 50) * 1000:8.1f}   p95 {_percentile(first_bytes, 95) * 1000:8.1f}   "
+              f"p99 {_percentile(first_bytes, 99) * 1000:8.1f}")
+
+    if count:
+        print("per request:  "
+              f"{metrics.get('calendent_llm_calls_total', 0) / count:.2f} LLM calls, "
+              f"{metrics.get('calendent_agent_tool_calls_total', 0) / count:.2f} tool calls, "
+              f"{metrics.get('calendent_google_api_calls_total', 0) / count:.2f} Google calls, "
+              f"{metrics.get('calendent_llm_tokens_total', 0) / count:.0f} tokens")
+    outcomes = {name.split(":", 1)[1]: int(value) for name, value in metrics.items() if name.startswith("outcome:") and value}
+    print(f"answered by:  {', '.join(f'{name} {value}' for name, value in sorted(outcomes.items()))}")
+    api_calls = ", ".join(f"{method} {value}" for method, value in sorted(outcome["api_calls"].items()))
+    print(f"calendar API: {api_calls or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=4, help="requests sent first and left out of the results")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--stream", action="store_true", help="use /api/chat/stream and report time to first byte")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds per fake Gemini call")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="seconds per fake Calendar round trip")
+    parser.add_argument("--density", type=int, default=4, help="seeded events per weekday")
+    parser.add_argument("--qps", type=float, default=float(os.getenv("CALENDAR_QPS", "10")), help="Calendar API rate limit")
+    parser.add_argument("--no-prefetch", dest="prefetch", action="store_false", help="don't refresh the event cache in the background")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO logging")
+    args = parser.parse_args()
+
+    # Everything stays in-process: no real key, no keep-alive pings, no warm-up against Google
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+    os.environ.setdefault("CALENDAR_ID", "bench@example.com")
+    os.environ.setdefault("STARTUP_WARMUP", "false")
+    os.environ.setdefault("CONVERSATION_BACKEND", "memory")
+    os.environ.setdefault("CHAT_MAX_CONCURRENCY", str(max(32, args.concurrency)))
+    os.environ.setdefault("CHAT_MAX_QUEUED", str(max(64, args.concurrency * 2)))
+
+    report(args, asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Micro-benchmark for DateParser, which runs on every chat message.
+
+Run from the repository root:
+    python -m benchmarks.bench_date_parser
+"""
+import time
+from backend.services.date_parser import DateParser, _extract_time, _scan
+
+MESSAGES = [
+    "What's my schedule for today?",
+    "What's my availability tomorrow?",
+    "Book a 30-minute meeting tomorrow afternoon",
+    "Show me this week's availability",
+    "Book meeting tomorrow 2 PM",
+    "Schedule call next Tuesday 10 AM",
+    "What's free this Friday?",
+    "Block 4th July from 2 to 3:30 pm",
+    "Am I free between 3 nov and 5 nov?",
+    "Can we meet in 3 days in the evening?",
+]
+CURRENT_DATE = "2025-07-01"
+
+
+def _per_call_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in MESSAGES:
+            func(message)
+    return (time.perf_counter() - start) / (iterations * len(MESSAGES)) * 1e6
+
+
+def _cold(message: str):
+    _scan.cache_clear()
+    _extract_time.cache_clear()
+    DateParser.parse_date_range(message, CURRENT_DATE)
+    DateParser.extract_time_from_text(message)
+
+
+def _warm(message: str):
+    DateParser.parse_date_range(message, CURRENT_DATE)
+    DateParser.extract_time_from_text(message)
+
+
+def main(iterations: int = 2000):
+    cold = _per_call_us(_cold, iterations)
+    _warm(MESSAGES[0])
+    warm = _per_call_us(_warm, iterations)
+    print(f"messages: {len(MESSAGES)}, iterations: {iterations}")
+    print(f"cold parse (cache cleared): {cold:8.2f} us/message")
+    print(f"warm parse (LRU hit):       {warm:8.2f} us/message")
+    print(f"cache: {DateParser.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
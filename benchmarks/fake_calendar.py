@@ -0,0 +1,257 @@
+"""In-memory stand-in for the Google Calendar API used by the load benchmarks.
+
+Implements the slice of the discovery client CalendarService touches:
+events().list/insert/get (with paging and syncToken syncs), freebusy().query
+and batch requests. Every HTTP round trip sleeps for a configurable latency,
+and calendars are seeded with a configurable number of events per working day.
+"""
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+import httplib2
+from googleapiclient.errors import HttpError
+from backend.config import settings
+
+SEED_TITLES = ["Standup", "1:1", "Design review", "Customer call", "Planning", "Interview", "Lunch", "Focus time"]
+
+
+def _http_error(status: int, reason: str) -> HttpError:
+    content = f'{{"error": {{"code": {status}, "message": "{reason}", "errors": [{{"reason": "{reason}"}}]}}}}'
+    return HttpError(httplib2.Response({"status": status}), content.encode())
+
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _event_start(event: Dict) -> datetime:
+    return _parse(event["start"]["dateTime"])
+
+
+def _event_end(event: Dict) -> datetime:
+    return _parse(event["end"]["dateTime"])
+
+
+class _Request:
+    def __init__(self, api: "FakeCalendarAPI", method_id: str, run: Callable[[], Any]):
+        self.methodId = method_id
+        self._api = api
+        self._run = run
+
+    def execute(self, **kwargs):
+        self._api.round_trip(self.methodId)
+        return self._run()
+
+
+class _Batch:
+    def __init__(self, api: "FakeCalendarAPI", callback):
+        self._api = api
+        self._callback = callback
+        self._requests: List = []
+
+    def add(self, request: _Request, request_id: Optional[str] = None):
+        self._requests.append((request_id or str(len(self._requests)), request))
+
+    def execute(self, **kwargs):
+        # One round trip for the whole batch, like the real multipart request
+        self._api.round_trip("batch")
+        for request_id, request in self._requests:
+            try:
+                response, error = request._run(), None
+            except HttpError as e:
+                response, error = None, e
+            self._callback(request_id, response, error)
+
+
+class _Calendar:
+    def __init__(self):
+        self.events: Dict[str, Dict] = {}
+        self.changes: List[str] = []
+
+
+class _Events:
+    def __init__(self, api: "FakeCalendarAPI"):
+        self._api = api
+
+    def list(self, calendarId: str, timeMin: str = None, timeMax: str = None, syncToken: str = None,
+             pageToken: str = None, maxResults: int = 250, **kwargs) -> _Request:
+        return _Request(self._api, "calendar.events.list",
+                        lambda: self._api.list_events(calendarId, timeMin, timeMax, syncToken, pageToken, maxResults))
+
+    def insert(self, calendarId: str, body: Dict, **kwargs) -> _Request:
+        return _Request(self._api, "calendar.events.insert", lambda: self._api.insert_event(calendarId, body))
+
+    def get(self, calendarId: str, eventId: str, **kwargs) -> _Request:
+        return _Request(self._api, "calendar.events.get", lambda: self._api.get_event(calendarId, eventId))
+
+
+class _FreeBusy:
+    def __init__(self, api: "FakeCalendarAPI"):
+        self._api = api
+
+    def query(self, body: Dict) -> _Request:
+        return _Request(self._api, "calendar.freebusy.query", lambda: self._api.free_busy(body))
+
+
+class FakeCalendarAPI:
+    """Thread-safe fake of a Calendar API service handle.
+
+    Any calendar id is accepted; each is seeded on first use with `density`
+    events per weekday between working hours, from `lookback_days` ago to
+    `horizon_days` ahead. `latency` seconds (+/- `jitter` as a fraction) are
+    slept per round trip, on the calling worker thread like real network I/O.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.3,
+        density: int = 4,
+        lookback_days: int = 7,
+        horizon_days: int = 60,
+        seed: int = 7,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.density = density
+        self.lookback_days = lookback_days
+        self.horizon_days = horizon_days
+        self.seed = seed
+        self.calls: Counter = Counter()
+        self._calendars: Dict[str, _Calendar] = {}
+        self._lock = threading.Lock()
+        self._ids = 0
+
+    # Discovery-client surface
+
+    def events(self) -> _Events:
+        return _Events(self)
+
+    def freebusy(self) -> _FreeBusy:
+        return _FreeBusy(self)
+
+    def new_batch_http_request(self, callback=None) -> _Batch:
+        return _Batch(self, callback)
+
+    # Behaviour
+
+    def round_trip(self, method: str):
+        with self._lock:
+            self.calls[method] += 1
+        if self.latency > 0:
+            time.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _calendar(self, calendar_id: str) -> _Calendar:
+        calendar = self._calendars.get(calendar_id)
+        if calendar is None:
+            calendar = self._calendars[calendar_id] = self._seeded(calendar_id)
+        return calendar
+
+    def _seeded(self, calendar_id: str) -> _Calendar:
+        rng = random.Random(f"{self.seed}:{calendar_id}")
+        calendar = _Calendar()
+        today = datetime.now(settings.IST).date()
+        work_start = datetime.strptime(settings.WORKING_HOURS_START, "%H:%M")
+        work_end = datetime.strptime(settings.WORKING_HOURS_END, "%H:%M")
+        half_hours = int((work_end - work_start).total_seconds() // 1800)
+        for offset in range(-self.lookback_days, self.horizon_days + 1):
+            day = today + timedelta(days=offset)
+            if day.weekday() >= 5:
+                continue
+            for _ in range(self.density):
+                start = settings.IST.localize(datetime.combine(day, work_start.time())) + timedelta(
+                    minutes=30 * rng.randrange(half_hours - 1)
+                )
+                end = start + timedelta(minutes=rng.choice((30, 30, 60, 60, 90)))
+                self._store(calendar, {
+                    "summary": rng.choice(SEED_TITLES),
+                    "start": {"dateTime": start.isoformat(), "timeZone": "Asia/Kolkata"},
+                    "end": {"dateTime": end.isoformat(), "timeZone": "Asia/Kolkata"},
+                })
+        return calendar
+
+    def _store(self, calendar: _Calendar, body: Dict) -> Dict:
+        if not body.get("id"):
+            self._ids += 1
+            body = dict(body, id=f"fake{self._ids:08d}")
+        event = dict(body, status="confirmed", htmlLink=f"https://calendar.example/event/{body['id']}")
+        calendar.events[event["id"]] = event
+        calendar.changes.append(event["id"])
+        return event
+
+    def list_events(self, calendar_id: str, time_min: Optional[str], time_max: Optional[str],
+                    sync_token: Optional[str], page_token: Optional[str], max_results: int) -> Dict:
+        with self._lock:
+            calendar = self._calendar(calendar_id)
+            if sync_token is not None:
+                if not sync_token.isdigit() or int(sync_token) > len(calendar.changes):
+                    raise _http_error(410, "fullSyncRequired")
+                changed = dict.fromkeys(calendar.changes[int(sync_token):])
+                events = [calendar.events[event_id] for event_id in changed]
+            else:
+                low = _parse(time_min) if time_min else None
+                high = _parse(time_max) if time_max else None
+                events = sorted(
+                    (event for event in calendar.events.values()
+                     if (high is None or _event_start(event) < high) and (low is None or _event_end(event) > low)),
+                    key=_event_start,
+                )
+            next_sync_token = str(len(calendar.changes))
+
+        offset = int(page_token or 0)
+        page = {"items": [dict(event) for event in events[offset:offset + max_results]]}
+        if offset + max_results < len(events):
+            page["nextPageToken"] = str(offset + max_results)
+        else:
+            page["nextSyncToken"] = next_sync_token
+        return page
+
+    def insert_event(self, calendar_id: str, body: Dict) -> Dict:
+        with self._lock:
+            calendar = self._calendar(calendar_id)
+            if body.get("id") in calendar.events:
+                raise _http_error(409, "duplicate")
+            return dict(self._store(calendar, dict(body)))
+
+    def get_event(self, calendar_id: str, event_id: str) -> Dict:
+        with self._lock:
+            event = self._calendar(calendar_id).events.get(event_id)
+        if event is None:
+            raise _http_error(404, "notFound")
+        return dict(event)
+
+    def free_busy(self, body: Dict) -> Dict:
+        low, high = _parse(body["timeMin"]), _parse(body["timeMax"])
+        calendars = {}
+        with self._lock:
+            for item in body.get("items", []):
+                busy = [
+                    {"start": _event_start(event).isoformat(), "end": _event_end(event).isoformat()}
+                    for event in sorted(self._calendar(item["id"]).events.values(), key=_event_start)
+                    if _event_start(event) < high and _event_end(event) > low
+                ]
+                calendars[item["id"]] = {"busy": busy}
+        return {"kind": "calendar#freeBusy", "timeMin": body["timeMin"], "timeMax": body["timeMax"], "calendars": calendars}
+
+    def event_count(self, calendar_id: str = None) -> int:
+        with self._lock:
+            return len(self._calendar(calendar_id or settings.CALENDAR_ID).events)
+
+
+class FakeServicePool:
+    """Drop-in for CalendarServicePool that hands out the one thread-safe fake."""
+
+    def __init__(self, api: FakeCalendarAPI):
+        self.api = api
+        self.size = 1
+
+    @contextmanager
+    def service(self):
+        yield self.api
+
+    def stats(self) -> Dict:
+        return {"fake": True, "calls": dict(self.api.calls)}
@@ -0,0 +1,175 @@
+"""Scripted stand-in for Gemini used by the load benchmarks.
+
+A script matches the user's message and replays a fixed sequence of tool
+calls, then a final answer built from the tool outputs. The step is derived
+from the conversation itself (how many tool results follow the message), so
+one model instance serves any number of concurrent agent runs.
+"""
+import asyncio
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_DATE_CONTEXT_RE = re.compile(r"\(Date context: (\d{4}-\d{2}-\d{2})")
+_TIME_RE = re.compile(r"\b(\d{1,2})\s*(am|pm)\b", re.IGNORECASE)
+
+
+class Step(NamedTuple):
+    tool: str
+    args: Callable[[str], Dict]  # built from the user's message
+
+
+class Script(NamedTuple):
+    name: str
+    pattern: str
+    steps: List[Step]
+    reply: Callable[[List[str]], str]  # built from the tool outputs
+
+
+def when(message: str) -> str:
+    """The date the chat endpoint resolved for this message, or the phrase itself."""
+    match = _DATE_CONTEXT_RE.search(message)
+    return match.group(1) if match else "today"
+
+
+def clock(message: str, default: str = "") -> str:
+    match = _TIME_RE.search(message)
+    if not match:
+        return default
+    hour = int(match.group(1)) % 12 + (12 if match.group(2).lower() == "pm" else 0)
+    return f"{hour:02d}:00"
+
+
+def _field(outputs: List[str], name: str, default: str = "") -> str:
+    try:
+        return str(json.loads(outputs[-1]).get(name, default))
+    except (IndexError, ValueError, AttributeError):
+        return default
+
+
+def _booking_reply(outputs: List[str]) -> str:
+    status = _field(outputs, "status")
+    if status in ("booked", "duplicate"):
+        return _field(outputs, "message")
+    if status == "conflict":
+        return "That time clashes with another meeting. Here are some free alternatives you could pick from."
+    return "I couldn't find a free slot for that. Would another day work?"
+
+
+DEFAULT_SCRIPTS = [
+    Script(
+        "book",
+        r"\b(book|schedule|set up|arrange)\b",
+        [Step("find_and_book", lambda message: {
+            "title": "Meeting",
+            "when": when(message),
+            "duration_minutes": 30,
+            "start_time": clock(message),
+            "earliest": "13:00" if "afternoon" in message.lower() else "",
+        })],
+        _booking_reply,
+    ),
+    Script(
+        "week",
+        r"\bweek\b",
+        [Step("week_summary", lambda message: {"week_of": when(message)})],
+        lambda outputs: f"Your week has {_field(outputs, 'meetings', '0')} meetings; "
+                        f"{_field(outputs, 'freest_day')} is the freest day.",
+    ),
+    Script(
+        "slots",
+        r"\b(slot|slots|suggest|find me)\b",
+        [Step("suggest_time_slots", lambda message: {"date": when(message), "duration_minutes": 60})],
+        lambda outputs: "Here are a few times that work:\n" + (outputs[-1] if outputs else ""),
+    ),
+    Script(
+        "check",
+        r"\b(free|available|availability|busy|schedule|calendar|agenda)\b",
+        [Step("resolve_and_check", lambda message: {"when": when(message)})],
+        lambda outputs: "Here's what your day looks like: " + (outputs[-1][:200] if outputs else ""),
+    ),
+    Script("chat", r".", [], lambda outputs: "I can check your calendar, suggest times and book meetings."),
+]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Tool-calling chat model that replays `scripts` with `latency` seconds per call."""
+
+    scripts: List[Script] = DEFAULT_SCRIPTS
+    latency: float = 0.0
+    chunk_words: int = 4
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        turn = max(index for index, message in enumerate(messages) if isinstance(message, HumanMessage))
+        text = str(messages[turn].content)
+        outputs = [str(message.content) for message in messages[turn + 1:] if isinstance(message, ToolMessage)]
+        script = next(script for script in self.scripts if re.search(script.pattern, text, re.IGNORECASE))
+
+        prompt_tokens = sum(len(str(message.content)) for message in messages) // 4
+        if len(outputs) < len(script.steps):
+            step = script.steps[len(outputs)]
+            args = {key: value for key, value in step.args(text).items() if value != ""}
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": step.tool, "args": args, "id": f"call_{script.name}_{len(outputs)}"}],
+                usage_metadata={"input_tokens": prompt_tokens, "output_tokens": 20, "total_tokens": prompt_tokens + 20},
+            )
+        reply = script.reply(outputs)
+        reply_tokens = len(reply) // 4
+        return AIMessage(
+            content=reply,
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": reply_tokens, "total_tokens": prompt_tokens + reply_tokens},
+        )
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    def _chunks(self, message: AIMessage) -> Iterator[ChatGenerationChunk]:
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                    for index, call in enumerate(message.tool_calls)
+                ],
+                usage_metadata=message.usage_metadata,
+            ))
+            return
+        words = message.content.split(" ")
+        for offset in range(0, len(words), self.chunk_words):
+            text = " ".join(words[offset:offset + self.chunk_words])
+            if offset + self.chunk_words < len(words):
+                text += " "
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=message.usage_metadata))
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        # Time to first token is most of a real call; the rest arrives quickly
+        time.sleep(self.latency)
+        for chunk in self._chunks(self._next_message(messages)):
+            if run_manager and chunk.text:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._next_message(messages)):
+            if run_manager and chunk.text:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
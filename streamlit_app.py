@@ -1,3 +1,4 @@
+import json
 import os
 import streamlit as st
 import requests
@@ -85,6 +86,35 @@ if "processing" not in st.session_state:
     st.session_state.processing = False
 
 
+TOOL_PROGRESS = {
+    "get_calendar_availability": "📅 Checking your calendar...",
+    "get_range_availability": "📅 Checking your calendar...",
+    "suggest_time_slots": "💡 Finding free slots...",
+    "find_group_slots": "👥 Comparing calendars...",
+    "book_if_free": "📝 Booking...",
+    "create_calendar_events_bulk": "📝 Booking...",
+    "resolve_and_check": "📅 Checking your calendar...",
+    "find_and_book": "📝 Booking...",
+    "week_summary": "📊 Summarizing your week...",
+}
+
+
+def iter_sse(response):
+    """Yield (event, data) pairs from a server-sent events response."""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
 def send_message(message):
     if not st.session_state.processing:
         st.session_state.messages.append({"role": "user", "content": message})
@@ -164,35 +194,53 @@ with col2:
                 break
 
         if last_user_message:
-            with st.spinner("🧠 Processing..."):
-                try:
-                    response = requests.post(
-                        f"{BACKEND_URL}/api/chat",
-                        json={
-                            "message": last_user_message,
-                            "user_id": st.session_state.user_id
-                        },
-                        timeout=30
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        bot_response = data["response"]
-
-                        if data.get("booking_success"):
-                            st.balloons()
-
-                        st.session_state.messages.append({"role": "assistant", "content": bot_response})
+            placeholder = st.empty()
+            bot_response = None
+            progress = "🧠 Processing..."
+            streamed = ""
+            try:
+                # The read timeout applies between events, so long agent runs keep streaming
+                with requests.post(
+                    f"{BACKEND_URL}/api/chat/stream",
+                    json={
+                        "message": last_user_message,
+                        "user_id": st.session_state.user_id
+                    },
+                    stream=True,
+                    timeout=(10, 60)
+                ) as response:
+                    if response.status_code != 200:
+                        bot_response = f"❌ Server Error: {response.text}"
                     else:
-                        error_msg = f"❌ Server Error: {response.text}"
-                        st.session_state.messages.append({"role": "assistant", "content": error_msg})
-
-                except Exception as e:
-                    error_msg = f"❌ Connection error: {str(e)}"
-                    st.session_state.messages.append({"role": "assistant", "content": error_msg})
-
-                st.session_state.processing = False
-                st.rerun()
+                        for event, data in iter_sse(response):
+                            if event == "tool_start":
+                                progress = TOOL_PROGRESS.get(data.get("tool"), "🔧 Working...")
+                            elif event == "tool_end":
+                                progress = "🧠 Thinking..."
+                            elif event == "token":
+                                streamed += data["text"]
+                            elif event == "done":
+                                bot_response = data["response"]
+                                if data.get("booking_success"):
+                                    st.balloons()
+                            elif event == "error":
+                                bot_response = data["detail"]
+
+                            placeholder.markdown(f"""
+                            <div class="bot-message">
+                                <strong>🤖 TailorTalk:</strong> {bot_response or streamed or progress}
+                            </div>
+                            """, unsafe_allow_html=True)
+
+                if bot_response is None:
+                    bot_response = streamed or "❌ The connection closed before the answer arrived."
+
+            except Exception as e:
+                bot_response = f"❌ Connection error: {str(e)}"
+
+            st.session_state.messages.append({"role": "assistant", "content": bot_response})
+            st.session_state.processing = False
+            st.rerun()
 
 st.markdown("### ⚡ Quick Actions")
 col1, col2, col3, col4 = st.columns(4)
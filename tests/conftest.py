@@ -0,0 +1,20 @@
+import os
+
+# Settings are read at import time; keep everything offline
+os.environ.setdefault("GOOGLE_API_KEY", "offline-tests")
+os.environ.setdefault("CALENDAR_ID", "tests@example.com")
+os.environ.setdefault("STARTUP_WARMUP", "false")
+os.environ.setdefault("CONVERSATION_BACKEND", "memory")
+
+import pytest
+from backend.services.api_scheduler import ApiScheduler
+from backend.services.calendar_service import CalendarService, _calendar_service
+from benchmarks.fake_calendar import FakeCalendarAPI, FakeServicePool
+
+
+@pytest.fixture
+def fake_calendar() -> FakeCalendarAPI:
+    """An empty in-memory calendar behind get_calendar_service()."""
+    api = FakeCalendarAPI(latency=0, density=0)
+    _calendar_service.override(CalendarService(pool=FakeServicePool(api), scheduler=ApiScheduler(rate=1000, burst=1000, backoff_base=0.001)))
+    return api
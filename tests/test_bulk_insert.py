@@ -0,0 +1,67 @@
+from collections import Counter
+from backend.config import settings
+from backend.services.calendar_service import event_body, get_calendar_service
+from benchmarks.fake_calendar import _http_error
+
+DATES = ["2026-10-26", "2026-10-27", "2026-10-28"]
+
+
+def _events():
+    return [event_body("Standup", day, "09:30", "09:45") for day in DATES]
+
+
+def _stored(api):
+    items = api.list_events(settings.CALENDAR_ID, None, None, None, None, 250)["items"]
+    return Counter(event["start"]["dateTime"][:10] for event in items)
+
+
+def test_throttled_calls_inside_a_batch_are_retried(fake_calendar):
+    insert = fake_calendar.insert_event
+    failures = Counter()
+
+    def flaky_insert(calendar_id, body):
+        # Every event is throttled twice, alternating 429 and a rate-limit 403
+        if failures[body["id"]] < 2:
+            failures[body["id"]] += 1
+            raise _http_error(429, "rateLimitExceeded") if failures[body["id"]] == 1 else _http_error(403, "rateLimitExceeded")
+        return insert(calendar_id, body)
+
+    fake_calendar.insert_event = flaky_insert
+    results = get_calendar_service().create_events_bulk(_events())
+    assert [result["status"] for result in results] == ["booked"] * 3
+    assert _stored(fake_calendar) == Counter(DATES)
+    assert fake_calendar.calls["batch"] == 3
+
+
+def test_retried_batch_does_not_book_twice(fake_calendar):
+    make_batch = fake_calendar.new_batch_http_request
+    lost = []
+
+    def batch_losing_first_response(callback=None):
+        batch = make_batch(callback)
+        execute = batch.execute
+
+        def execute_once(**kwargs):
+            execute(**kwargs)
+            if not lost:
+                # The inserts landed, but the response never made it back
+                lost.append(True)
+                raise _http_error(503, "backendError")
+
+        batch.execute = execute_once
+        return batch
+
+    fake_calendar.new_batch_http_request = batch_losing_first_response
+    results = get_calendar_service().create_events_bulk(_events())
+    assert [result["status"] for result in results] == ["booked"] * 3
+    assert _stored(fake_calendar) == Counter(DATES)
+
+
+def test_calls_still_throttled_after_the_retries_fail(fake_calendar):
+    def throttled(calendar_id, body):
+        raise _http_error(429, "rateLimitExceeded")
+
+    fake_calendar.insert_event = throttled
+    results = get_calendar_service().create_events_bulk(_events())
+    assert [result["status"] for result in results] == ["error"] * 3
+    assert fake_calendar.calls["batch"] == get_calendar_service().scheduler.max_retries + 1
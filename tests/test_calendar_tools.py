@@ -0,0 +1,12 @@
+import pytest
+from backend.tools.calendar_tools import book_if_free
+
+
+@pytest.mark.parametrize("start_time, end_time", [("9:00", "10:00"), ("09:00", "10:00"), ("9:30", "9:45")])
+def test_book_if_free_compares_times_not_strings(fake_calendar, start_time, end_time):
+    assert book_if_free.func("Sync", "2026-10-22", start_time, end_time).startswith("🎉 SUCCESS!")
+
+
+@pytest.mark.parametrize("start_time, end_time", [("10:00", "9:00"), ("10:00", "10:00")])
+def test_book_if_free_rejects_backwards_times(fake_calendar, start_time, end_time):
+    assert book_if_free.func("Sync", "2026-10-22", start_time, end_time).startswith("❌ End time")
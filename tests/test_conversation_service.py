@@ -0,0 +1,20 @@
+from backend.services.conversation_service import ConversationService
+from backend.services.conversation_store import InMemoryConversationStore
+
+
+def test_context_is_dropped_with_an_evicted_conversation():
+    service = ConversationService(InMemoryConversationStore(max_bytes=4000))
+    service.update_history("alice", "user", "book a sync tomorrow at 2 pm")
+    assert "book a sync" in service.get_context("alice")
+    assert service.context_builder.stats()["cached_users"] == 1
+
+    # Bob's long message pushes the store over its byte budget, so Alice is evicted
+    service.update_history("bob", "user", "x" * 5000)
+    assert service.store.recent("alice", 10) == []
+    assert service.context_builder.stats()["cached_users"] == 0
+
+    # Coming back starts a fresh context instead of appending to the old one
+    service.update_history("alice", "user", "what about friday")
+    context = service.get_context("alice")
+    assert "what about friday" in context
+    assert "book a sync" not in context
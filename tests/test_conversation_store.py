@@ -0,0 +1,47 @@
+import sqlite3
+import pytest
+from backend.services.conversation_store import Message, SQLiteConversationStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteConversationStore(str(tmp_path / "conversations.db"), batch_size=1, flush_interval=60, busy_timeout=0.05)
+    yield store
+    store.close()
+
+
+def _contents(messages):
+    return [message.content for message in messages]
+
+
+def test_write_lock_held_by_another_worker(store, tmp_path):
+    store.append("alice", Message("user", "before"))
+    other = sqlite3.connect(str(tmp_path / "conversations.db"), isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        # Neither call may fail the request, and nothing buffered may be lost
+        store.append("alice", Message("assistant", "during 1"))
+        store.append("alice", Message("user", "during 2"))
+        store.append("bob", Message("user", "someone else"))
+        assert _contents(store.recent("alice", 10)) == ["before", "during 1", "during 2"]
+        assert store.stats()["pending_writes"] == 3
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert _contents(store.recent("alice", 10)) == ["before", "during 1", "during 2"]
+    assert _contents(store.recent("bob", 10)) == ["someone else"]
+    assert store.stats()["pending_writes"] == 0
+
+
+def test_recent_keeps_the_limit_with_buffered_messages(store, tmp_path):
+    store.append("alice", Message("user", "one"))
+    other = sqlite3.connect(str(tmp_path / "conversations.db"), isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        store.append("alice", Message("assistant", "two"))
+        store.append("alice", Message("user", "three"))
+        assert _contents(store.recent("alice", 2)) == ["two", "three"]
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
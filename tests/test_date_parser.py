@@ -0,0 +1,118 @@
+import pytest
+from backend.services.date_parser import DateParser
+
+
+@pytest.mark.parametrize("text, start, end", [
+    ("book a sync tomorrow at 2 pm", "14:00", "15:00"),
+    ("book a sync tomorrow at 14:30", "14:30", "15:30"),
+    ("at 9:00", "09:00", "10:00"),
+    ("at 3 p.m.", "15:00", "16:00"),
+    ("11:30 am", "11:30", "12:30"),
+    ("2 pm to 3:30 pm", "14:00", "15:30"),
+    ("10:30 pm to 11:30 pm", "22:30", "23:30"),
+    ("2-3 pm", "14:00", "15:00"),
+    ("2 to 3:30 pm", "14:00", "15:30"),
+    ("10-11 am", "10:00", "11:00"),
+    ("11-1 pm", "11:00", "13:00"),
+    ("14:00-15:30", "14:00", "15:30"),
+    ("12 pm", "12:00", "13:00"),
+    ("12 am", "00:00", "01:00"),
+])
+def test_explicit_times(text, start, end):
+    expected = {"start_time": start, "end_time": end}
+    assert DateParser.extract_time_from_text(text) == expected
+    assert DateParser.match_time(text) == expected
+
+
+@pytest.mark.parametrize("text, start, end", [
+    ("tomorrow afternoon", "13:00", "16:00"),
+    ("sometime tomorrow", "09:00", "10:00"),
+    ("meet at 25:00", "09:00", "10:00"),
+    ("meeting on 2026-10-22", "09:00", "10:00"),
+    ("2-3", "02:00", "03:00"),
+])
+def test_guessed_times_are_not_matches(text, start, end):
+    assert DateParser.extract_time_from_text(text) == {"start_time": start, "end_time": end}
+    assert DateParser.match_time(text) is None
+
+
+@pytest.mark.parametrize("time_str, expected", [
+    ("11:30 am", "11:30"),
+    ("10:30 pm", "22:30"),
+    ("9:00", "09:00"),
+    ("14:30", "14:30"),
+    ("12 am", "00:00"),
+])
+def test_normalize_time(time_str, expected):
+    assert DateParser._normalize_time(time_str) == expected
+
+
+def test_add_hours_with_meridiem():
+    assert DateParser._add_hours("11:30 am") == "12:30"
+    assert DateParser._add_hours("10:30 pm") == "23:30"
+
+
+TODAY = "2025-07-01"  # a Tuesday
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("today", "2025-07-01"),
+    ("tomorrow", "2025-07-02"),
+    ("am i free tmrw", "2025-07-02"),
+    ("day after tomorrow", "2025-07-03"),
+    ("yesterday", "2025-06-30"),
+    ("friday", "2025-07-04"),
+    ("this friday", "2025-07-04"),
+    ("on monday", "2025-07-07"),
+    ("tuesday", "2025-07-01"),
+    ("next tuesday", "2025-07-08"),
+    ("fri", "2025-07-04"),
+    ("next sat", "2025-07-12"),
+    ("on wed", "2025-07-02"),
+    ("in 3 days", "2025-07-04"),
+    ("in a week", "2025-07-08"),
+    ("in two weeks", "2025-07-15"),
+    ("2025-07-04", "2025-07-04"),
+    ("4/7", "2025-07-04"),
+    ("4/7/26", "2026-07-04"),
+    ("4th July", "2025-07-04"),
+    ("July 4", "2025-07-04"),
+    ("4 july 2026", "2026-07-04"),
+    ("march 3", "2026-03-03"),
+    ("july 4-6", "2025-07-04"),
+])
+def test_natural_dates(text, expected):
+    assert DateParser.parse_natural_date(text, TODAY) == expected
+
+
+@pytest.mark.parametrize("text, start, end", [
+    ("tomorrow", "2025-07-02", "2025-07-02"),
+    ("this week", "2025-07-01", "2025-07-06"),
+    ("next week", "2025-07-07", "2025-07-13"),
+    ("this weekend", "2025-07-05", "2025-07-06"),
+    ("next weekend", "2025-07-12", "2025-07-13"),
+    ("july 4-6", "2025-07-04", "2025-07-06"),
+    ("4th to 6th of july", "2025-07-04", "2025-07-06"),
+    ("from july 4 to july 6", "2025-07-04", "2025-07-06"),
+    ("between 3 nov and 5 nov", "2025-11-03", "2025-11-05"),
+    ("monday to wednesday", "2025-07-07", "2025-07-09"),
+    ("friday to monday", "2025-07-04", "2025-07-07"),
+    ("mon-wed", "2025-07-07", "2025-07-09"),
+    ("from sat to sun", "2025-07-05", "2025-07-06"),
+])
+def test_date_ranges(text, start, end):
+    assert DateParser.parse_date_range(text, TODAY) == (start, end)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I sat down today", "2025-07-01"),
+    ("c'mon, book it tomorrow", "2025-07-02"),
+    ("the sun is out, meet on friday", "2025-07-04"),
+    ("a 1/2 hour sync tomorrow", "2025-07-02"),
+    ("1/2 hour", None),
+    ("book 3/4 of the slots", None),
+    ("31/2", None),
+    ("no date here", None),
+])
+def test_words_that_are_not_dates(text, expected):
+    assert DateParser.parse_natural_date(text, TODAY) == expected
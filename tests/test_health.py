@@ -0,0 +1,24 @@
+import asyncio
+import threading
+import httpx
+from backend.config import settings
+from backend.main import app
+from backend.services import concurrency
+
+
+def test_health_answers_while_calendar_workers_are_stuck():
+    release = threading.Event()
+    stuck = [concurrency._calendar_executor.submit(release.wait) for _ in range(settings.CALENDAR_WORKER_THREADS)]
+
+    async def health():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://tests") as client:
+            return await asyncio.wait_for(client.get("/api/health"), timeout=2)
+
+    try:
+        response = asyncio.run(health())
+        assert response.status_code == 200
+        assert "conversations" in response.json()
+    finally:
+        release.set()
+        for future in stuck:
+            future.result()
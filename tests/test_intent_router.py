@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+import pytest
+from backend.config import settings
+from backend.services.busy_index import event_minutes, ist_clock
+from backend.services.intent_router import IntentRouter
+
+# Slot finding reads the real clock, so "tomorrow" has to be tomorrow
+TODAY = datetime.now(settings.IST).date().isoformat()
+TOMORROW = (datetime.now(settings.IST).date() + timedelta(days=1)).isoformat()
+
+
+def _booked(api):
+    events = api.list_events(settings.CALENDAR_ID, None, None, None, None, 250)["items"]
+    return [(event["start"]["dateTime"][:10], *map(ist_clock, event_minutes(event))) for event in events]
+
+
+@pytest.mark.parametrize("message, start, end", [
+    ("Book a sync tomorrow at 2 pm", "14:00", "15:00"),
+    ("Book a sync tomorrow at 14:30", "14:30", "15:30"),
+    ("Book a sync tomorrow 2-3 pm", "14:00", "15:00"),
+    ("Book a meeting tomorrow 10:30 pm to 11:30 pm", "22:30", "23:30"),
+    ("Book a 30 minute sync tomorrow at 11:30 am", "11:30", "12:00"),
+])
+def test_books_the_time_asked_for(fake_calendar, message, start, end):
+    response = IntentRouter().route(message, TODAY)
+    assert response is not None and response.startswith("🎉 SUCCESS!")
+    assert _booked(fake_calendar) == [(TOMORROW, start, end)]
+
+
+@pytest.mark.parametrize("message", [
+    "Book a sync tomorrow at 3",
+    "Book a sync tomorrow 2-3",
+    "Book a sync tomorrow at 25:00",
+    "Book a sync tomorrow 11 pm to 1 am",
+    "Book a sync tomorrow afternoon at 3",
+    "Book a 3 hour sync tomorrow at 10 pm",
+])
+def test_unclear_bookings_go_to_the_agent(fake_calendar, message):
+    assert IntentRouter().route(message, TODAY) is None
+    assert _booked(fake_calendar) == []
+
+
+def test_period_booking_picks_a_free_slot(fake_calendar):
+    response = IntentRouter().route("Book a 30-minute meeting tomorrow afternoon", TODAY)
+    assert response is not None and response.startswith("🎉 SUCCESS!")
+    assert _booked(fake_calendar) == [(TOMORROW, "13:00", "13:30")]
+
+
+def test_period_without_a_free_slot_goes_to_the_agent(fake_calendar):
+    # The morning is only two hours long
+    assert IntentRouter().route("Book a 3 hour workshop tomorrow morning", TODAY) is None
+    assert _booked(fake_calendar) == []
+
+
+def test_tool_errors_go_to_the_agent(fake_calendar, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("backend unavailable")
+
+    monkeypatch.setattr(fake_calendar, "insert_event", broken)
+    router = IntentRouter()
+    assert router.route("Book a sync tomorrow at 2 pm", TODAY) is None
+    assert router.stats()["routed"] == 0
+
+
+def test_availability_at_a_time_goes_to_the_agent(fake_calendar):
+    router = IntentRouter()
+    assert router.route("Am I free tomorrow at 3pm?", TODAY) is None
+    assert router.route("Am I free tomorrow at 15:00?", TODAY) is None
+    assert router.route("Am I free tomorrow?", TODAY) is not None
+    assert router.stats()["by_intent"] == {"availability": 1}
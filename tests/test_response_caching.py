@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from backend.agents.call_accounting import CallAccountingHandler
+from backend.agents.chat_agent import ChatAgent
+from backend.api import chat
+from backend.config import settings
+from backend.services.calendar_service import get_calendar_service
+from backend.services.response_cache import ResponseCache
+from benchmarks.fake_llm import Script, ScriptedChatModel, Step
+
+TODAY = "2026-10-21"
+
+
+def _run(script: Script) -> CallAccountingHandler:
+    agent = ChatAgent(llm=ScriptedChatModel(scripts=[script]))
+    accounting = CallAccountingHandler()
+    asyncio.run(agent.aprocess_message("check tomorrow", TODAY, "", accounting))
+    return accounting
+
+
+def test_clean_run(fake_calendar):
+    accounting = _run(Script("check", ".", [Step("resolve_and_check", lambda _: {"when": "2026-10-22"})],
+                             lambda outputs: "You're free."))
+    assert accounting.clean
+
+
+def test_tool_error_is_not_clean(fake_calendar):
+    accounting = _run(Script("check", ".", [Step("resolve_and_check", lambda _: {"when": "someday maybe"})],
+                             lambda outputs: "Something went wrong."))
+    assert accounting.tool_errors == 1
+    assert not accounting.clean
+
+
+def test_iteration_limit_is_not_clean(fake_calendar):
+    steps = [Step("resolve_and_check", lambda _: {"when": "2026-10-22"})] * 6
+    accounting = _run(Script("loop", ".", steps, lambda outputs: "done"))
+    assert accounting.stopped
+    assert not accounting.clean
+
+
+@pytest.mark.parametrize("tool_errors, stopped, cached", [(0, False, True), (1, False, False), (0, True, False)])
+def test_only_clean_answers_are_cached(fake_calendar, monkeypatch, tool_errors, stopped, cached):
+    cache = ResponseCache()
+    monkeypatch.setattr(chat, "response_cache", cache)
+    key = cache.key("am i free tomorrow", ("2026-10-22", "2026-10-22"), TODAY, chat.calendar_version())
+    accounting = CallAccountingHandler()
+    accounting.tool_errors, accounting.stopped = tool_errors, stopped
+    chat._remember(key, "Here's your day.", accounting)
+    assert (cache.get(key) is not None) == cached
+
+
+def test_booking_from_another_worker_changes_the_key(fake_calendar, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_MAX_STALENESS", 5.0)
+    # The event store only syncs a window around the real today
+    today = datetime.now(settings.IST).date()
+    tomorrow = (today + timedelta(days=1)).isoformat()
+    key = chat._cache_key("am i free tomorrow", (tomorrow, tomorrow), today.isoformat())
+    fake_calendar.insert_event("tests@example.com", {
+        "summary": "Booked elsewhere",
+        "start": {"dateTime": f"{tomorrow}T10:00:00+05:30"},
+        "end": {"dateTime": f"{tomorrow}T11:00:00+05:30"},
+    })
+    # Well within the event store's own staleness bound, but past the response cache's
+    get_calendar_service().event_store()._synced_at -= 6
+    assert chat._cache_key("am i free tomorrow", (tomorrow, tomorrow), today.isoformat()) != key
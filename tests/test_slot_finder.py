@@ -0,0 +1,83 @@
+import math
+import random
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+import pytest
+from backend.config import settings
+from backend.services.busy_index import to_minutes
+from backend.services.slot_finder import find_free_slots, free_gaps, merge_intervals
+
+
+def _round_up(moment: datetime, granularity: timedelta, anchor: datetime) -> datetime:
+    return anchor + math.ceil((moment - anchor) / granularity) * granularity
+
+
+def _reference_slots(busy, start_date, end_date, duration_minutes, work_start, work_end, buffer_minutes,
+                     granularity_minutes, limit, now) -> List[Tuple[datetime, datetime]]:
+    """find_free_slots as it was on aware datetimes, before the search moved to epoch minutes."""
+    duration = timedelta(minutes=duration_minutes)
+    buffer = timedelta(minutes=buffer_minutes)
+    granularity = timedelta(minutes=granularity_minutes)
+    merged = merge_intervals((start - buffer, end + buffer) for start, end in busy)
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+    candidates = []
+    for day_index, day in enumerate(days):
+        window_start = settings.IST.localize(datetime.combine(day, datetime.strptime(work_start, "%H:%M").time()))
+        window_end = settings.IST.localize(datetime.combine(day, datetime.strptime(work_end, "%H:%M").time()))
+        if window_end <= now:
+            continue
+        if window_start < now:
+            window_start = _round_up(now, granularity, window_start)
+        for gap_start, gap_end in free_gaps(merged, window_start, window_end):
+            slot_start = _round_up(gap_start, granularity, window_start)
+            while slot_start + duration <= gap_end:
+                flush = slot_start == gap_start or slot_start + duration == gap_end
+                candidates.append((day_index, not flush, slot_start, slot_start + duration))
+                slot_start += granularity
+    candidates.sort(key=lambda candidate: candidate[:3])
+
+    per_day = max(1, math.ceil(limit / max(1, len(days))))
+    chosen: List[Tuple[datetime, datetime]] = []
+    for cap in (per_day, limit):
+        taken = {}
+        for start, _ in chosen:
+            taken[start.date()] = taken.get(start.date(), 0) + 1
+        for _, _, start, end in candidates:
+            if len(chosen) >= limit:
+                break
+            if taken.get(start.date(), 0) >= cap:
+                continue
+            if any(start < other_end and other_start < end for other_start, other_end in chosen):
+                continue
+            chosen.append((start, end))
+            taken[start.date()] = taken.get(start.date(), 0) + 1
+    return sorted(chosen)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_the_datetime_implementation(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        first = date(2026, 10, 19) + timedelta(days=rng.randint(0, 5))
+        last = first + timedelta(days=rng.randint(0, 6))
+        busy = []
+        for _ in range(rng.randint(0, 25)):
+            day = first + timedelta(days=rng.randint(0, (last - first).days))
+            start = settings.IST.localize(datetime.combine(day, datetime.min.time())) + timedelta(minutes=rng.randint(6 * 60, 20 * 60))
+            busy.append((start, start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 240]))))
+        options = dict(
+            duration_minutes=rng.choice([15, 30, 60, 90]),
+            work_start=rng.choice(["08:00", "09:00", "09:30"]),
+            work_end=rng.choice(["17:00", "18:15"]),
+            buffer_minutes=rng.choice([0, 0, 10]),
+            granularity_minutes=rng.choice([5, 15, 30]),
+            limit=rng.choice([1, 3, 6, 10]),
+            now=settings.IST.localize(datetime(2026, 10, 19, rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59))),
+        )
+        expected = _reference_slots(busy, first, last, **options)
+        slots = find_free_slots([(to_minutes(start), to_minutes(end)) for start, end in busy], first, last, **options)
+        assert [(slot.start, slot.end) for slot in slots] == expected
+        assert [slot.start.strftime("%Y-%m-%d %H:%M") for slot in slots] == [
+            start.astimezone(settings.IST).strftime("%Y-%m-%d %H:%M") for start, _ in expected
+        ]